@@ -0,0 +1,160 @@
+"""Compares typedload against the compiled decoders on realistic CTFd payloads.
+
+Sequence fields are decoded eagerly here, see lazy_scoreboard.py for lazy decoding.
+
+poetry run python benchmarks/decoding.py
+"""
+
+import timeit
+import typing
+from collections.abc import Sequence
+from typing import Any
+
+import typedload
+import typedload.dataloader
+
+from ctfd_discord_bot.utils.ctfd_api import (
+    ScoresRequest,
+    TeamSolvesRequest,
+    UsersRequest,
+)
+from ctfd_discord_bot.utils.decoding import Decoder
+
+REPEATS = 5
+
+# typedload cannot load abstract sequences by itself, so load them as lists
+typedload_loader = typedload.dataloader.Loader()
+typedload_loader.handlers.insert(
+    0,
+    (
+        lambda ty: typing.get_origin(ty) is Sequence,
+        lambda loader, value, ty: loader.load(value, list[typing.get_args(ty)[0]]),
+    ),
+)
+
+
+def user(id: int) -> dict[str, Any]:
+    return {
+        "affiliation": None,
+        "team_id": (id - 1) // 4 + 1,
+        "bracket_id": None,
+        "oauth_id": None,
+        "id": id,
+        "fields": [
+            {
+                "value": str(10**17 + id),
+                "field_id": 1,
+                "description": "Your Discord user ID",
+                "type": "text",
+                "name": "Discord ID",
+            }
+        ],
+        "name": f"user{id}",
+        "website": None,
+        "country": "AU",
+    }
+
+
+def score(pos: int) -> dict[str, Any]:
+    return {
+        "pos": pos,
+        "account_id": pos,
+        "account_url": f"/teams/{pos}",
+        "account_type": "team",
+        "oauth_id": None,
+        "name": f"Team {pos}",
+        "score": 10000 - pos,
+        "bracket_id": None,
+        "bracket_name": None,
+        "members": [
+            {
+                "id": (pos - 1) * 4 + i,
+                "oauth_id": None,
+                "name": f"user{(pos - 1) * 4 + i}",
+                "score": 100 * i,
+                "bracket_id": None,
+                "bracket_name": None,
+            }
+            for i in range(1, 5)
+        ],
+    }
+
+
+def team_solve(id: int) -> dict[str, Any]:
+    return {
+        "user": {"name": "user1", "id": 1},
+        "ip": "127.0.0.1",
+        "challenge": {
+            "name": f"Challenge {id}",
+            "category": "web",
+            "id": id,
+            "value": 100,
+        },
+        "team": {"name": "Team 1", "id": 1},
+        "date": "2025-01-01T00:00:00Z",
+        "provided": "flag{example}",
+        "id": id,
+        "challenge_id": id,
+        "type": "correct",
+    }
+
+
+def paginated(data: list[Any]) -> dict[str, Any]:
+    return {
+        "success": True,
+        "data": data,
+        "meta": {
+            "pagination": {
+                "page": 1,
+                "next": 2,
+                "prev": None,
+                "pages": 60,
+                "per_page": 50,
+                "total": 3000,
+            }
+        },
+    }
+
+
+PAYLOADS: list[tuple[str, Any, Any]] = [
+    ("users page (50)", paginated([user(id) for id in range(1, 51)]), UsersRequest),
+    (
+        "scoreboard (1000)",
+        {"success": True, "data": [score(pos) for pos in range(1, 1001)]},
+        ScoresRequest,
+    ),
+    (
+        "team solves (60)",
+        {"success": True, "data": [team_solve(id) for id in range(1, 61)]},
+        TeamSolvesRequest,
+    ),
+]
+
+
+def bench(func: Any) -> float:
+    number, _ = timeit.Timer(func).autorange()
+    return min(timeit.repeat(func, number=number, repeat=REPEATS)) / number
+
+
+def main():
+    decoder = Decoder(lazy=False)
+    trusted = Decoder(trusted=True, lazy=False)
+
+    print(f"{'payload':<20}{'typedload':>12}{'compiled':>18}{'trusted':>18}")
+    for name, payload, ty in PAYLOADS:
+        expected = typedload_loader.load(payload, ty)
+        assert decoder.load(payload, ty) == expected
+        assert trusted.load(payload, ty) == expected
+
+        base = bench(lambda p=payload, t=ty: typedload_loader.load(p, t))
+        compiled = bench(lambda p=payload, t=ty: decoder.load(p, t))
+        fast = bench(lambda p=payload, t=ty: trusted.load(p, t))
+        print(
+            f"{name:<20}{base * 1000:10.3f}ms"
+            f"{compiled * 1000:9.3f}ms ({base / compiled:4.1f}x)"
+            f"{fast * 1000:9.3f}ms ({base / fast:4.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""Compares eager and lazy decoding of a 5000-team scoreboard read like /scoreboard.
+
+Each run parses the JSON body and decodes it, then reads the top 10 teams and
+their members. Memory is measured from before the body is parsed, so the raw
+rows a lazy result keeps alive are counted.
+
+poetry run python benchmarks/lazy_scoreboard.py
+"""
+
+import gc
+import json
+import time
+import tracemalloc
+from collections.abc import Callable
+from typing import Any
+
+from ctfd_discord_bot.utils.ctfd_api import ScoresRequest
+from ctfd_discord_bot.utils.decoding import Decoder
+
+TEAMS = 5000
+REPEATS = 20
+
+
+def score(pos: int) -> dict[str, Any]:
+    return {
+        "pos": pos,
+        "account_id": pos,
+        "account_url": f"/teams/{pos}",
+        "account_type": "team",
+        "oauth_id": None,
+        "name": f"Team {pos}",
+        "score": 100000 - pos,
+        "bracket_id": None,
+        "bracket_name": None,
+        "members": [
+            {
+                "id": (pos - 1) * 4 + i,
+                "oauth_id": None,
+                "name": f"user{(pos - 1) * 4 + i}",
+                "score": 100 * i,
+                "bracket_id": None,
+                "bracket_name": None,
+            }
+            for i in range(1, 5)
+        ],
+    }
+
+
+BODY = json.dumps(
+    {"success": True, "data": [score(pos) for pos in range(1, TEAMS + 1)]}
+)
+
+
+def top_10(decoder: Decoder) -> Any:
+    scoreboard = decoder.load(json.loads(BODY), ScoresRequest).data
+    for entry in scoreboard[:10]:
+        for member in entry.members:
+            _ = member.name
+
+    return scoreboard
+
+
+def every_team(decoder: Decoder) -> Any:
+    scoreboard = decoder.load(json.loads(BODY), ScoresRequest).data
+    for entry in scoreboard:
+        for member in entry.members:
+            _ = member.name
+
+    return scoreboard
+
+
+def timed(func: Callable[[], Any]) -> float:
+    times: list[float] = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+
+    return min(times)
+
+
+def memory(func: Callable[[], Any]) -> tuple[int, int]:
+    """Returns the peak and retained bytes of running `func` and keeping its result."""
+    gc.collect()
+    tracemalloc.start()
+    result = func()
+    gc.collect()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    del result
+    return peak, retained
+
+
+def main():
+    parse = timed(lambda: json.loads(BODY))
+    print(f"{TEAMS} teams, json.loads alone takes {parse * 1000:.1f}ms")
+    print(f"{'':<22}{'time':>10}{'peak':>12}{'retained':>12}")
+
+    for name, decoder in (
+        ("eager", Decoder(lazy=False)),
+        ("lazy", Decoder()),
+        ("eager, trusted", Decoder(trusted=True, lazy=False)),
+        ("lazy, trusted", Decoder(trusted=True)),
+    ):
+        for access, func in (("top 10", top_10), ("all", every_team)):
+            elapsed = timed(lambda f=func, d=decoder: f(d))
+            peak, retained = memory(lambda f=func, d=decoder: f(d))
+            print(
+                f"{f'{name} ({access})':<22}{elapsed * 1000:8.1f}ms"
+                f"{peak / 2**20:10.1f}MB{retained / 2**20:10.1f}MB"
+            )
+
+
+if __name__ == "__main__":
+    main()
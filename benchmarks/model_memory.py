@@ -0,0 +1,159 @@
+"""Reports the memory held per decoded model at 10k-account scale.
+
+Each model is compared against a copy of itself without __slots__, as the models
+were defined before.
+
+poetry run python benchmarks/model_memory.py
+"""
+
+import dataclasses
+import functools
+import gc
+import operator
+import tracemalloc
+import types
+import typing
+from typing import Any
+
+from ctfd_discord_bot.utils.ctfd_api import Score, Team, User
+from ctfd_discord_bot.utils.decoding import Decoder
+
+COUNT = 10_000
+
+
+def user(id: int) -> dict[str, Any]:
+    return {
+        "affiliation": None,
+        "team_id": (id - 1) // 4 + 1,
+        "bracket_id": None,
+        "oauth_id": None,
+        "id": id,
+        "fields": [
+            {
+                "value": str(10**17 + id),
+                "field_id": 1,
+                "description": "Your Discord user ID",
+                "type": "text",
+                "name": "Discord ID",
+            }
+        ],
+        "name": f"user{id}",
+        "website": None,
+        "country": "AU",
+    }
+
+
+def team(id: int) -> dict[str, Any]:
+    return {
+        "id": id,
+        "banned": False,
+        "bracket_id": None,
+        "fields": [],
+        "affiliation": None,
+        "oauth_id": None,
+        "secret": None,
+        "hidden": False,
+        "name": f"Team {id}",
+        "email": None,
+        "created": "2025-01-01T00:00:00+00:00",
+        "country": None,
+        "website": None,
+        "captain_id": (id - 1) * 4 + 1,
+    }
+
+
+def score(pos: int) -> dict[str, Any]:
+    return {
+        "pos": pos,
+        "account_id": pos,
+        "account_url": f"/teams/{pos}",
+        "account_type": "team",
+        "oauth_id": None,
+        "name": f"Team {pos}",
+        "score": 10000 - pos,
+        "bracket_id": None,
+        "bracket_name": None,
+        "members": [
+            {
+                "id": (pos - 1) * 4 + i,
+                "oauth_id": None,
+                "name": f"user{(pos - 1) * 4 + i}",
+                "score": 100 * i,
+                "bracket_id": None,
+                "bracket_name": None,
+            }
+            for i in range(1, 5)
+        ],
+    }
+
+
+@functools.cache
+def unslotted(ty: Any) -> Any:
+    """Returns `ty` with every dataclass in it replaced by a copy without __slots__."""
+    if isinstance(ty, type) and dataclasses.is_dataclass(ty):
+        # methods are copied from the whole MRO, the fields already include the bases'
+        namespace = {
+            name: value
+            for cls in reversed(ty.__mro__)
+            for name, value in vars(cls).items()
+            if isinstance(value, types.FunctionType)
+            and (not name.startswith("__") or name == "__post_init__")
+        }
+        return dataclasses.make_dataclass(
+            ty.__name__,
+            [
+                (
+                    field.name,
+                    unslotted(field.type),
+                    dataclasses.field(
+                        default=field.default,
+                        default_factory=field.default_factory,
+                        init=field.init,
+                        repr=field.repr,
+                        compare=field.compare,
+                    ),
+                )
+                for field in dataclasses.fields(ty)
+            ],
+            namespace=namespace,
+        )
+
+    origin, args = typing.get_origin(ty), typing.get_args(ty)
+    if origin is None or origin is typing.Literal:
+        return ty
+    if origin is types.UnionType or origin is typing.Union:
+        return functools.reduce(operator.or_, map(unslotted, args))
+    return origin[tuple(map(unslotted, args))]
+
+
+def measure(rows: list[dict[str, Any]], ty: Any) -> float:
+    """Returns the bytes allocated per model, excluding the raw JSON rows."""
+    decoder = Decoder()
+    decoder.load(rows[0], ty)  # build the loader outside the measurement
+
+    gc.collect()
+    tracemalloc.start()
+    models = [decoder.load(row, ty) for row in rows]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    del models
+    return size / len(rows)
+
+
+def main():
+    print(f"Bytes per decoded model, {COUNT} of each")
+    print(f"{'':<20}{'unslotted':>10}{'slotted':>10}{'saved':>8}")
+    for name, factory, ty in (
+        ("User", user, User),
+        ("Team", team, Team),
+        ("Score (4 members)", score, Score),
+    ):
+        rows = [factory(id) for id in range(1, COUNT + 1)]
+        before = measure(rows, unslotted(ty))
+        after = measure(rows, ty)
+        print(f"{name:<20}{before:10.0f}{after:10.0f}{1 - after / before:8.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,321 @@
+"""Compares the request cost of the two webhook solve detection modes.
+
+A mock CTFd instance is started locally, seeded with solves, and then one poll
+cycle (including resolving the Discord IDs to announce) is timed in each mode
+after a burst of new solves lands. The original poll loop, which fetched the team
+solves and the user of each new solve one at a time, is timed as a baseline.
+
+    poetry run python benchmarks/webhook_poll.py
+"""
+
+import asyncio
+import os
+import random
+import tempfile
+import time
+from typing import Any
+
+from aiohttp import web
+
+from ctfd_discord_bot.utils.ctfd_api import (
+    ChallengeSolvesRequest,
+    CTFd_API,
+    FullUserRequest,
+    SolveStatisticsRequest,
+    TeamSolvesRequest,
+)
+from ctfd_discord_bot.utils.environment import Config, WebhookMode
+
+HOST, PORT = "127.0.0.1", 8765
+CHALLENGES = 60
+TEAMS = 300
+USERS_PER_TEAM = 4
+INITIAL_SOLVES = 3000
+NEW_SOLVES = 200
+LATENCY = 0.005  # simulated CTFd response time in seconds
+
+
+class MockCTFd:
+    def __init__(self):
+        self.requests = 0
+        self.submissions: list[dict[str, Any]] = []
+        self.solved: set[tuple[int, int]] = set()
+        self.random = random.Random(0)
+
+    def add_solves(self, count: int):
+        while count > 0:
+            team_id = self.random.randint(1, TEAMS)
+            challenge_id = self.random.randint(1, CHALLENGES)
+            if (team_id, challenge_id) in self.solved:
+                continue
+
+            self.solved.add((team_id, challenge_id))
+            user_id = (team_id - 1) * USERS_PER_TEAM + self.random.randint(
+                1, USERS_PER_TEAM
+            )
+            self.submissions.append(
+                {
+                    "id": len(self.submissions) + 1,
+                    "challenge_id": challenge_id,
+                    "challenge": {
+                        "id": challenge_id,
+                        "name": f"Challenge {challenge_id}",
+                        "category": "misc",
+                        "value": 100,
+                    },
+                    "user": {"id": user_id, "name": f"user{user_id}"},
+                    "team": {"id": team_id, "name": f"Team {team_id}"},
+                    "date": "2025-01-01T00:00:00Z",
+                    "type": "correct",
+                    "provided": "flag{}",
+                    "ip": "127.0.0.1",
+                }
+            )
+            count -= 1
+
+    @web.middleware
+    async def middleware(
+        self, request: web.Request, handler: Any
+    ) -> web.StreamResponse:
+        self.requests += 1
+        await asyncio.sleep(LATENCY)
+        return await handler(request)
+
+    def app(self) -> web.Application:
+        app = web.Application(middlewares=[self.middleware])
+        app.router.add_get("/api/v1/statistics/challenges/solves", self.statistics)
+        app.router.add_get("/api/v1/challenges/{id}/solves", self.challenge_solves)
+        app.router.add_get("/api/v1/teams/{id}/solves", self.team_solves)
+        app.router.add_get("/api/v1/users", self.users)
+        app.router.add_get("/api/v1/users/{id}", self.user)
+        app.router.add_get("/api/v1/submissions", self.submissions_list)
+        return app
+
+    async def statistics(self, _request: web.Request) -> web.Response:
+        counts = dict.fromkeys(range(1, CHALLENGES + 1), 0)
+        for sub in self.submissions:
+            counts[sub["challenge_id"]] += 1
+
+        data = [
+            {"id": id, "name": f"Challenge {id}", "solves": solves}
+            for id, solves in counts.items()
+        ]
+        return web.json_response({"success": True, "data": data})
+
+    async def challenge_solves(self, request: web.Request) -> web.Response:
+        challenge_id = int(request.match_info["id"])
+        data = [
+            {
+                "account_id": sub["team"]["id"],
+                "name": sub["team"]["name"],
+                "date": sub["date"],
+                "account_url": f"/teams/{sub['team']['id']}",
+            }
+            for sub in self.submissions
+            if sub["challenge_id"] == challenge_id
+        ]
+        return web.json_response({"success": True, "data": data})
+
+    async def team_solves(self, request: web.Request) -> web.Response:
+        team_id = int(request.match_info["id"])
+        data = [sub for sub in self.submissions if sub["team"]["id"] == team_id]
+        return web.json_response({"success": True, "data": data})
+
+    async def users(self, request: web.Request) -> web.Response:
+        users = [self.user_data(id) for id in range(1, TEAMS * USERS_PER_TEAM + 1)]
+        return web.json_response(paginate(users, request, 50))
+
+    async def user(self, request: web.Request) -> web.Response:
+        data = self.user_data(int(request.match_info["id"]))
+        return web.json_response({"success": True, "data": data})
+
+    def user_data(self, user_id: int) -> dict[str, Any]:
+        return {
+            "affiliation": None,
+            "team_id": (user_id - 1) // USERS_PER_TEAM + 1,
+            "bracket_id": None,
+            "oauth_id": None,
+            "id": user_id,
+            "fields": [
+                {
+                    "value": str(10**17 + user_id),
+                    "field_id": 1,
+                    "description": "",
+                    "type": "text",
+                    "name": "Discord ID",
+                }
+            ],
+            "name": f"user{user_id}",
+            "website": None,
+            "country": None,
+            "change_password": False,
+            "language": None,
+            "secret": None,
+            "created": "2025-01-01T00:00:00Z",
+            "type": "user",
+            "hidden": False,
+            "verified": True,
+            "banned": False,
+        }
+
+    async def submissions_list(self, request: web.Request) -> web.Response:
+        return web.json_response(paginate(self.submissions, request, 20))
+
+
+def paginate(items: list[Any], request: web.Request, per_page: int) -> Any:
+    page = int(request.query.get("page", 1))
+    per_page = int(request.query.get("per_page", per_page))
+    pages = max(1, -(-len(items) // per_page))
+    return {
+        "success": True,
+        "data": items[(page - 1) * per_page : page * per_page],
+        "meta": {
+            "pagination": {
+                "page": page,
+                "next": page + 1 if page < pages else None,
+                "prev": page - 1 if page > 1 else None,
+                "pages": pages,
+                "per_page": per_page,
+                "total": len(items),
+            }
+        },
+    }
+
+
+async def baseline_poll(
+    api: CTFd_API, challenge_solves: dict[int, set[int]]
+) -> set[tuple[Any, str]]:
+    """The webhook poll loop as it was before the solve detection modes."""
+    new_solves: set[tuple[Any, str]] = set()
+    is_init = len(challenge_solves) == 0
+
+    total_solves = await api._parse_request(  # pyright: ignore[reportPrivateUsage]
+        "GET", "statistics/challenges/solves", SolveStatisticsRequest
+    )
+
+    for challenge in total_solves.data:
+        stored_solves = challenge_solves.setdefault(challenge.id, set())
+        if len(stored_solves) == challenge.solves:
+            continue
+
+        solves = await api._parse_request(  # pyright: ignore[reportPrivateUsage]
+            "GET", f"challenges/{challenge.id}/solves", ChallengeSolvesRequest
+        )
+        for solve in solves.data:
+            if solve.account_id in stored_solves:
+                continue
+
+            stored_solves.add(solve.account_id)
+            if is_init:
+                continue
+
+            team_solves = (
+                await api._parse_request(  # pyright: ignore[reportPrivateUsage]
+                    "GET", f"teams/{solve.account_id}/solves", TeamSolvesRequest
+                )
+            ).data
+            team_solve = next(
+                filter(
+                    lambda team_solve, challenge=challenge: (
+                        team_solve.challenge_id == challenge.id
+                    ),
+                    team_solves,
+                )
+            )
+
+            user = (
+                await api._parse_request(  # pyright: ignore[reportPrivateUsage]
+                    "GET", f"users/{team_solve.user.id}", FullUserRequest
+                )
+            ).data
+            discord_id = user.get_field(api.config.discord_id_field)
+            if discord_id is None or discord_id.value == "":
+                continue
+
+            new_solves.add((discord_id.value, challenge.name))
+
+    return new_solves
+
+
+async def run(mode: WebhookMode | None) -> tuple[int, float, int]:
+    """Times one poll in `mode`, or in the baseline loop if it is None."""
+    if mode is not None:
+        os.environ["WEBHOOK_MODE"] = mode.value
+
+    ctfd = MockCTFd()
+    ctfd.add_solves(INITIAL_SOLVES)
+
+    runner = web.AppRunner(ctfd.app())
+    await runner.setup()
+    await web.TCPSite(runner, HOST, PORT).start()
+
+    with tempfile.TemporaryDirectory() as state_dir:
+        os.environ["STATE_PATH"] = os.path.join(state_dir, "state.sqlite3")
+        api = CTFd_API(Config(), webhook=False)
+        await api._refresh_cache()  # pyright: ignore[reportPrivateUsage]
+
+        if mode is None:
+            challenge_solves: dict[int, set[int]] = {}
+            await baseline_poll(api, challenge_solves)
+
+            ctfd.add_solves(NEW_SOLVES)
+            ctfd.requests = 0
+
+            start = time.perf_counter()
+            solves = await baseline_poll(api, challenge_solves)
+            elapsed = time.perf_counter() - start
+
+            await api.close()
+            await runner.cleanup()
+            return (ctfd.requests, elapsed, len(solves))
+
+        if mode == WebhookMode.SUBMISSIONS:
+            poll = await api._poll_submissions()  # pyright: ignore[reportPrivateUsage]
+        else:
+            poll = await api._poll_challenge_solves(True)  # pyright: ignore[reportPrivateUsage]
+        api._apply_webhook_poll(poll)  # pyright: ignore[reportPrivateUsage]
+
+        ctfd.add_solves(NEW_SOLVES)
+        ctfd.requests = 0
+
+        start = time.perf_counter()
+        if mode == WebhookMode.SUBMISSIONS:
+            poll = await api._poll_submissions()  # pyright: ignore[reportPrivateUsage]
+        else:
+            poll = await api._poll_challenge_solves(False)  # pyright: ignore[reportPrivateUsage]
+        solves = poll.solves
+        await api._discord_ids_for({solve[0] for solve in solves})  # pyright: ignore[reportPrivateUsage]
+        elapsed = time.perf_counter() - start
+
+        await api.close()
+
+    await runner.cleanup()
+    return (ctfd.requests, elapsed, len(solves))
+
+
+async def main():
+    os.environ.update(
+        CTFD_INSTANCE_URL=f"http://{HOST}:{PORT}",
+        CTFD_ACCESS_TOKEN="token",
+        EVENT_NAME="Benchmark",
+        WEBHOOK_URL=f"http://{HOST}:{PORT}/webhook",
+        DISCORD_ID_FIELD="1",
+        BOT_TOKEN="token",
+        FEEDBACK_URL="https://example.com",
+    )
+
+    print(
+        f"{CHALLENGES} challenges, {TEAMS} teams, {INITIAL_SOLVES} existing solves,"
+        f" {NEW_SOLVES} new solves, {LATENCY * 1000:.0f}ms simulated latency"
+    )
+    for mode in (None, *WebhookMode):
+        requests, elapsed, solves = await run(mode)
+        name = "baseline" if mode is None else mode.value
+        print(
+            f"{name:>12}: {requests:4} requests, {elapsed:6.3f}s,"
+            f" {solves} solves announced"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,37 +1,162 @@
 import asyncio
+import hashlib
+import json
+import time
 import traceback
+from collections.abc import Iterator
+from contextlib import contextmanager
 from typing import Any
 
 import discord
-from aiohttp import ClientSession, ClientTimeout
+from aiohttp import ClientSession, ClientTimeout, web
 from discord import app_commands
 from discord.ext import commands
 from loguru import logger
 
-from ctfd_discord_bot.utils.environment import BotMode, Config
+from ctfd_discord_bot.utils.environment import BotMode, Config, ShardMode
+from ctfd_discord_bot.utils.errors import ConfigError, CTFdUnavailableError
+from ctfd_discord_bot.utils.metrics import observe_command, start_metrics_server
+from ctfd_discord_bot.utils.state import StateStore
 
 
-class CTFdBot(commands.Bot):
-    def __init__(self, config: Config):
+@contextmanager
+def startup_phase(name: str) -> Iterator[None]:
+    start = time.monotonic()
+    yield
+    logger.info(f"[Startup] {name} took {time.monotonic() - start:.2f}s.")
+
+
+def shard_options(config: Config) -> dict[str, Any]:
+    """Returns the shard_count and shard_ids to run this process with."""
+    match config.shard_mode:
+        case ShardMode.OFF:
+            return {"shard_count": 1, "shard_ids": None}
+
+        case ShardMode.AUTO:
+            return {"shard_count": config.shard_count or None, "shard_ids": None}
+
+        case ShardMode.FIXED:
+            if config.shard_count == 0 or len(config.shard_ids) == 0:
+                raise ConfigError(
+                    "SHARD_MODE=fixed requires both SHARD_COUNT and SHARD_IDS"
+                )
+
+            if any(shard_id >= config.shard_count for shard_id in config.shard_ids):
+                raise ConfigError(
+                    f"SHARD_IDS must be below SHARD_COUNT ({config.shard_count})"
+                )
+
+            return {
+                "shard_count": config.shard_count,
+                "shard_ids": sorted(set(config.shard_ids)),
+            }
+
+
+class CTFdBot(commands.AutoShardedBot):
+    metrics_runner: web.AppRunner | None = None
+    # time.monotonic() timestamp of when the bot was created, cleared once it is ready
+    started_at: float | None
+
+    def __init__(self, config: Config, *, force_sync: bool = False):
         self.config = config
+        self.force_sync = force_sync
+        self.started_at = time.monotonic()
 
         intents = discord.Intents.default()
-        super().__init__(command_prefix=".", intents=intents, help_command=None)
+        super().__init__(
+            command_prefix=".",
+            intents=intents,
+            help_command=None,
+            **shard_options(config),
+        )
+
+    @property
+    def owns_first_shard(self) -> bool:
+        """Whether this process runs shard 0, which receives every DM."""
+        return self.shard_ids is None or 0 in self.shard_ids
 
     async def setup_hook(self):
         self.tree.on_error = self.on_app_command_error
 
+        if self.config.metrics_port != 0:
+            with startup_phase("Starting the metrics server"):
+                self.metrics_runner = await start_metrics_server(
+                    self.config.metrics_host, self.config.metrics_port
+                )
+
         COGS = ["general", "ctfd"]
 
         for cog in COGS:
-            await self.load_extension(f"{__name__}.cogs.{cog}")
-            logger.debug(f"Loaded: bot.cogs.{cog}")
+            with startup_phase(f"Loading bot.cogs.{cog}"):
+                await self.load_extension(f"{__name__}.cogs.{cog}")
+
+        if not self.owns_first_shard:
+            # commands are global, so one process syncing them is enough
+            logger.warning(
+                "Not running shard 0, so slash commands are left for it to sync"
+                " and /register is redirected to DMs, which only shard 0 receives."
+            )
+            return
+
+        with startup_phase("Syncing slash commands"):
+            await self.sync_commands()
+
+    def command_tree_hash(self) -> str:
+        """Hashes everything about the slash commands that Discord is told on sync."""
+        entries = sorted(
+            (cmd.to_dict(self.tree) for cmd in self.tree.get_commands()),
+            key=lambda cmd: (cmd["type"], cmd["name"]),
+        )
+        payload = json.dumps(
+            {"application_id": self.application_id, "commands": entries},
+            sort_keys=True,
+            separators=(",", ":"),
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    async def sync_commands(self):
+        """Syncs the slash commands globally, unless they haven't changed since the last sync.
+
+        Syncing is slow and rate limited by Discord, so it is skipped on most restarts.
+        """
+        tree_hash = self.command_tree_hash()
+        state = StateStore(self.config.state_path)
+        try:
+            if not self.force_sync and state.get_meta("command_tree_hash") == tree_hash:
+                logger.info("Slash commands are unchanged, skipping the sync.")
+                return
+
+            synced = await self.tree.sync()
+            state.set_meta("command_tree_hash", tree_hash)
+        finally:
+            state.close()
 
-        synced = await self.tree.sync()
         logger.success(f"Synced {len(synced)} Slash Commands globally.")
         logger.debug(f"Synced: {[cmd.name for cmd in synced]}")
 
+    async def close(self):
+        if self.metrics_runner is not None:
+            await self.metrics_runner.cleanup()
+
+        await super().close()
+
+    async def on_app_command_completion(
+        self,
+        interaction: discord.Interaction,
+        _command: app_commands.Command[Any, ..., Any] | app_commands.ContextMenu,
+    ):
+        observe_command(interaction, "success")
+
+    async def on_shard_ready(self, shard_id: int):
+        logger.info(f"Shard {shard_id} of {self.shard_count} is ready.")
+
     async def on_ready(self):
+        if self.started_at is not None:
+            logger.success(
+                f"[Startup] Ready {time.monotonic() - self.started_at:.2f}s after starting."
+            )
+            self.started_at = None
+
         if (
             self.config.bot_mode == BotMode.PRODUCTION
             and self.config.push_url is not None
@@ -64,6 +189,8 @@ class CTFdBot(commands.Bot):
     async def on_app_command_error(
         self, interaction: discord.Interaction, error: app_commands.AppCommandError
     ):
+        observe_command(interaction, type(error).__name__)
+
         async def response_func(*args: Any, **kwargs: Any):
             # for some reason, just checking interaction.response.is_done does not work
             # and interaction.followup is in invalid state until a response is sent
@@ -72,7 +199,16 @@ class CTFdBot(commands.Bot):
             except discord.InteractionResponded:
                 await interaction.followup.send(*args, **kwargs)
 
-        if isinstance(error, app_commands.CommandInvokeError):
+        if isinstance(error, app_commands.CommandInvokeError) and isinstance(
+            error.original, CTFdUnavailableError
+        ):
+            logger.warning(f"[{error.command.name}] {error.original}")
+            await response_func(
+                "CTFd is currently unavailable, please try again shortly.",
+                ephemeral=True,
+            )
+
+        elif isinstance(error, app_commands.CommandInvokeError):
             original = error.original
             err_traceback = error.original.__traceback__
             error_loc = error.command.name
@@ -1,50 +1,32 @@
+import argparse
 import asyncio
-import os
-import sys
-from datetime import datetime
 
 import dotenv
-from loguru import logger
 
 from ctfd_discord_bot import CTFdBot
-from ctfd_discord_bot.utils.environment import BotMode, Config
+from ctfd_discord_bot.utils.environment import Config
+from ctfd_discord_bot.utils.log import setup_logging
 
 
-async def async_main(config: Config):
-    async with CTFdBot(config) as client:
+async def async_main(config: Config, *, force_sync: bool):
+    async with CTFdBot(config, force_sync=force_sync) as client:
         await client.start(config.bot_token, reconnect=True)
 
 
 def main():
-    dotenv.load_dotenv()
-    config = Config()
-
-    log_dir = "./logs"
-    if not os.path.exists(log_dir):
-        os.makedirs(log_dir)
-
-    log_filename = datetime.now().strftime("%Y-%m-%d-%H-%M-%S.log")
-    level = "DEBUG" if config.bot_mode == BotMode.DEVELOPMENT else "INFO"
-
-    logger.remove()  # remove default handler
-
-    logger.add(sys.stderr, level="ERROR")
-    logger.add(
-        sys.stdout,
-        level=level,
-        # avoid duplication of errors in console, since stderr often is piped to stdout
-        filter=lambda record: record["level"].no <= logger.level("WARNING").no,
+    parser = argparse.ArgumentParser(description="Runs the CTFd Discord bot.")
+    parser.add_argument(
+        "--force-sync",
+        action="store_true",
+        help="sync the slash commands even if they haven't changed since the last sync",
     )
+    args = parser.parse_args()
 
-    logger.add(
-        os.path.join(log_dir, log_filename),
-        level=level,
-        format="{time:YYYY-MM-DD HH:mm:ss.SSS} | {level: <8} | {name}:{function}:{line} - {message}",
-        rotation="2 MB",
-        diagnose=config.bot_mode == BotMode.DEVELOPMENT,
-    )
+    dotenv.load_dotenv()
+    config = Config()
+    setup_logging(config)
 
-    asyncio.run(async_main(config))
+    asyncio.run(async_main(config, force_sync=args.force_sync))
 
 
 if __name__ == "__main__":
@@ -1,16 +1,24 @@
+import asyncio
 import datetime
+import math
 import random
 import re
 import string
-import textwrap
+from typing import Any
 
 import discord
 from discord import app_commands
 from discord.ext import commands
-from loguru import logger
 
 from ctfd_discord_bot import CTFdBot
-from ctfd_discord_bot.utils.ctfd_api import Challenge, CTFd_API, Member, Score
+from ctfd_discord_bot.utils.cache import TTLCache
+from ctfd_discord_bot.utils.catalog import CatalogSnapshot, ChallengeCatalog
+from ctfd_discord_bot.utils.ctfd_api import CTFd_API, Member, Score, TeamSolve
+from ctfd_discord_bot.utils.environment import PollerMode
+from ctfd_discord_bot.utils.metrics import defer
+from ctfd_discord_bot.utils.scoreboard import ScoreboardPoller
+from ctfd_discord_bot.utils.text import pack_lines
+from ctfd_discord_bot.views.paginator import EmbedPaginator
 from ctfd_discord_bot.views.scoreboard import Scoreboard, get_team_embed
 
 EMAIL_REGEX = r"(?:[a-z0-9!#$%&'*+/=?^_`{|}~-]+(?:\.[a-z0-9!#$%&'*+/=?^_`{|}~-]+)*|\"(?:[\x01-\x08\x0b\x0c\x0e-\x1f\x21\x23-\x5b\x5d-\x7f]|\\[\x01-\x09\x0b\x0c\x0e-\x7f])*\")@(?:(?:[a-z0-9](?:[a-z0-9-]*[a-z0-9])?\.)+[a-z0-9](?:[a-z0-9-]*[a-z0-9])?|\[(?:(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)\.){3}(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?|[a-z0-9-]*[a-z0-9]:(?:[\x01-\x08\x0b\x0c\x0e-\x1f\x21-\x5a\x53-\x7f]|\\[\x01-\x09\x0b\x0c\x0e-\x7f])+)\])"
@@ -20,49 +28,48 @@ REGULAR_COOLDOWN = 3
 
 
 class CtfD(commands.Cog):
-    challenge_categories: dict[str, dict[int, tuple[str, int]]] = {}
-    total_challenges: int = 0
     current_registrations: set[int] = set()
 
     def __init__(self, client: CTFdBot):
         self.client = client
-        self.ctfd_api = CTFd_API(client.config)
+        self.ctfd_api = CTFd_API(
+            client.config,
+            webhook=client.config.poller_mode == PollerMode.EMBEDDED,
+        )
+        self.catalog = ChallengeCatalog(
+            self.ctfd_api, interval=client.config.catalog_refresh_interval
+        )
+        self.scoreboard_poller = ScoreboardPoller(
+            self.ctfd_api, interval=client.config.scoreboard_refresh_interval
+        )
+        # Rendered description pages, keyed by everything they were rendered from
+        self.rendered_pages: TTLCache[tuple[Any, ...], list[str]] = TTLCache(
+            client.config.render_cache_size, math.inf
+        )
 
     async def cog_load(self):
-        challenges = await self.ctfd_api.get_challenges()
-        for challenge in challenges:
-            self.total_challenges += 1
-            self.challenge_categories.setdefault(challenge.category, {})[
-                challenge.id
-            ] = (challenge.name, challenge.value)
-
-        logger.success(
-            f"Cached {len(self.challenge_categories)} challenge categories at startup."
-        )
+        await asyncio.gather(self.catalog.start(), self.scoreboard_poller.start())
 
     async def cog_unload(self):
+        await self.catalog.close()
+        await self.scoreboard_poller.close()
         await self.ctfd_api.close()
 
     @app_commands.command(name="scoreboard", description="Show the current scoreboard.")
     @app_commands.checks.cooldown(1, REGULAR_COOLDOWN)
     async def scoreboard(self, interaction: discord.Interaction):
-        await interaction.response.defer(thinking=True, ephemeral=True)
-
-        scoreboard = await self.ctfd_api.get_scoreboard()
-        if not scoreboard:
-            await interaction.followup.send("No scoreboard data found.", ephemeral=True)
+        # answered from memory, so there is no need to defer
+        snapshot = self.scoreboard_poller.snapshot
+        if len(snapshot.entries) == 0:
+            await interaction.response.send_message(
+                "No scoreboard data found.", ephemeral=True
+            )
             return
 
-        # Sort by position (rank)
-        scoreboard = sorted(
-            scoreboard, key=lambda x: x.pos if x.pos is not None else 1e9
-        )[:10]
-
-        # Default = show full list view
-        view = Scoreboard(scoreboard)
+        view = Scoreboard(snapshot.entries)
         embed = view.get_list_embed()
 
-        await interaction.followup.send(embed=embed, view=view, ephemeral=True)
+        await interaction.response.send_message(embed=embed, view=view, ephemeral=True)
 
     @app_commands.command(name="challenges", description="Get the challenges list.")
     @app_commands.describe(category="Filter challenges by category")
@@ -71,37 +78,24 @@ class CtfD(commands.Cog):
         if category == "All":
             category = None
 
-        if category is not None and category not in self.challenge_categories:
+        catalog = self.catalog.snapshot
+        if category is not None and category not in catalog.categories:
             await interaction.response.send_message(
                 "Invalid category entered!", ephemeral=True
             )
             return
 
-        await interaction.response.defer(thinking=True, ephemeral=True)
+        await defer(interaction, thinking=True, ephemeral=True)
 
-        challenges = await self.ctfd_api.get_challenges()
-
-        if len(challenges) == 0:
+        if catalog.total == 0:
             await interaction.followup.send("No challenges found.", ephemeral=True)
             return
 
-        if category is not None:
-            challenges = filter(lambda ch: ch.category == category, challenges)
-
-        categories: dict[str, list[Challenge]] = {}
-        for ch in challenges:
-            categories.setdefault(ch.category, []).append(ch)
-
-        description = ""
-        for category, ch_list in categories.items():
-            description += f"**{category}**\n"
-            for ch in ch_list:
-                description += (
-                    f"- {ch.name} *({ch.value} points, {ch.solves} solves)*\n"
-                )
-            description += "\n"
-
-        chunks = textwrap.wrap(description, MAX_DESC_LEN, replace_whitespace=False)
+        key = ("challenges", catalog.version, category)
+        chunks = self.rendered_pages.get(key)
+        if chunks is None:
+            chunks = self._render_challenges(catalog, category)
+            self.rendered_pages.set(key, chunks)
 
         embeds: list[discord.Embed] = []
         for i, chunk in enumerate(chunks, start=1):
@@ -115,8 +109,7 @@ class CtfD(commands.Cog):
             )
             embeds.append(embed)
 
-        for embed in embeds:
-            await interaction.followup.send(embed=embed, ephemeral=True)
+        await EmbedPaginator.send(interaction, embeds)
 
     @app_commands.command(
         name="progress", description="Get the solve progress of your team."
@@ -127,13 +120,14 @@ class CtfD(commands.Cog):
         if category == "All":
             category = None
 
-        if category is not None and category not in self.challenge_categories:
+        catalog = self.catalog.snapshot
+        if category is not None and category not in catalog.categories:
             await interaction.response.send_message(
                 "Invalid category entered!", ephemeral=True
             )
             return
 
-        await interaction.response.defer(thinking=True, ephemeral=True)
+        await defer(interaction, thinking=True, ephemeral=True)
 
         user = await self.ctfd_api.get_user_from_discord(interaction.user.id)
         if user is None:
@@ -146,56 +140,89 @@ class CtfD(commands.Cog):
             await interaction.followup.send("You are not in a team.", ephemeral=True)
             return
 
-        total = self.total_challenges
+        solves = await self.ctfd_api.get_team_solves(user.team_id)
+        # challenges released since the last catalog refresh are left out
+        solves = [solve for solve in solves if solve.challenge_id in catalog.challenges]
+
+        # the solve set is its own version, since solves are only ever added or removed,
+        # and progress doesn't show solve counts so only the layout version matters
+        solve_set = frozenset((solve.id, solve.user.name) for solve in solves)
+        key = ("progress", user.team_id, catalog.layout_version, solve_set, category)
+        chunks = self.rendered_pages.get(key)
+        if chunks is None:
+            chunks = self._render_progress(catalog, solves, category)
+            self.rendered_pages.set(key, chunks)
+
+        embeds: list[discord.Embed] = []
+        for i, chunk in enumerate(chunks, start=1):
+            embed = discord.Embed(
+                title="🚩 Team Progress"
+                if i == 1
+                else f":books: Team Progress (Part {i})",
+                description=chunk,
+                color=discord.Color.teal(),
+                timestamp=datetime.datetime.now(datetime.timezone.utc),
+            )
+            embeds.append(embed)
+
+        await EmbedPaginator.send(interaction, embeds)
+
+    def _render_challenges(
+        self, catalog: CatalogSnapshot, category: str | None
+    ) -> list[str]:
+        categories = catalog.categories
+        if category is not None:
+            categories = {category: categories[category]}
+
+        lines: list[str] = []
+        for category, ch_list in categories.items():
+            lines.append(f"**{category}**")
+            for ch in ch_list:
+                lines.append(f"- {ch.name} *({ch.value} points, {ch.solves} solves)*")
+            lines.append("")
+
+        return pack_lines(lines, MAX_DESC_LEN)
+
+    def _render_progress(
+        self,
+        catalog: CatalogSnapshot,
+        solves: list[TeamSolve],
+        category: str | None,
+    ) -> list[str]:
+        total = catalog.total
         categories: dict[str, dict[int, list[str | int | None]]] = {
             category: {
-                challenge_id: [challenge[0], challenge[1], None]
-                for challenge_id, challenge in challenges.items()
+                challenge.id: [challenge.name, challenge.value, None]
+                for challenge in challenges
             }
-            for category, challenges in self.challenge_categories.items()
+            for category, challenges in catalog.categories.items()
         }
 
-        solves = await self.ctfd_api.get_team_solves(user.team_id)
         solves_num = len(solves)
         for solve in solves:
-            categories[solve.challenge.category][solve.challenge_id][2] = (
-                solve.user.name
-            )
+            challenge = catalog.challenges[solve.challenge_id]
+            categories[challenge.category][challenge.id][2] = solve.user.name
 
         if category is not None:
             challenges = categories[category]
             total = len(challenges)
             solves_num = sum(
                 1
-                for _ in filter(
-                    lambda solve: solve.challenge.category == category, solves
-                )
+                for solve in solves
+                if catalog.challenges[solve.challenge_id].category == category
             )
             categories = {category: challenges}
 
-        description = f"**Progress:** {solves_num}/{total}\n"
+        lines = [f"**Progress:** {solves_num}/{total}"]
         for category, challenges in categories.items():
-            description += f"**{category}**\n"
+            lines.append(f"**{category}**")
             for challenge in challenges.values():
-                description += f"- {challenge[0]} *({challenge[1]} points)* {'is unsolved.' if challenge[2] is None else f'was solved by {challenge[2]}'}\n"
-            description += "\n"
-
-        chunks = textwrap.wrap(description, MAX_DESC_LEN, replace_whitespace=False)
-
-        embeds: list[discord.Embed] = []
-        for i, chunk in enumerate(chunks, start=1):
-            embed = discord.Embed(
-                title="🚩 Team Progress"
-                if i == 1
-                else f":books: Team Progress (Part {i})",
-                description=chunk,
-                color=discord.Color.teal(),
-                timestamp=datetime.datetime.now(datetime.timezone.utc),
-            )
-            embeds.append(embed)
+                lines.append(
+                    f"- {challenge[0]} *({challenge[1]} points)* {'is unsolved.' if challenge[2] is None else f'was solved by {challenge[2]}'}"
+                )
+            lines.append("")
 
-        for embed in embeds:
-            await interaction.followup.send(embed=embed, ephemeral=True)
+        return pack_lines(lines, MAX_DESC_LEN)
 
     @challenges.autocomplete("category")
     @progress.autocomplete("category")
@@ -204,7 +231,7 @@ class CtfD(commands.Cog):
     ):
         filtered = [
             app_commands.Choice(name=category, value=category)
-            for category in self.challenge_categories
+            for category in self.catalog.snapshot.categories
             if current.lower() in category.lower()
         ]
 
@@ -221,7 +248,7 @@ class CtfD(commands.Cog):
     )
     @app_commands.checks.cooldown(1, REGULAR_COOLDOWN)
     async def team(self, interaction: discord.Interaction, team: str | None):
-        await interaction.response.defer(thinking=True, ephemeral=True)
+        await defer(interaction, thinking=True, ephemeral=True)
 
         team_id: int
         if team is None:
@@ -240,37 +267,36 @@ class CtfD(commands.Cog):
 
             team_id = user.team_id
         else:
-            teams = await self.ctfd_api.get_teams(invalidate_cache=True)
-            try:
-                team_id = next(filter(lambda t: t.name == team, teams)).id
-            except StopIteration:
+            found_id = await self.ctfd_api.get_team_id(team)
+            if found_id is None:
                 await interaction.followup.send(
                     f"There is no team with the name `{team}`.", ephemeral=True
                 )
                 return
 
+            team_id = found_id
+
         full_team = await self.ctfd_api.get_full_team(team_id)
-        members: list[Member] = []
-        for member_id in full_team.members:
-            full_user = await self.ctfd_api.get_user(member_id)
-            members.append(
-                Member(
-                    bracket_id=full_user.bracket_id,
-                    bracket_name=None,
-                    id=member_id,
-                    name=full_user.name,
-                    oauth_id=full_user.oauth_id,
-                    score=full_user.score,
-                )
+        full_users = await asyncio.gather(
+            *map(self.ctfd_api.get_user, full_team.members)
+        )
+        members = [
+            Member(
+                bracket_id=full_user.bracket_id,
+                bracket_name=None,
+                id=full_user.id,
+                name=full_user.name,
+                oauth_id=full_user.oauth_id,
+                score=full_user.score,
             )
+            for full_user in full_users
+        ]
 
-        pos = None
-        if full_team.place is not None:
-            pos = re.sub("[^0-9]", "", full_team.place)
-            if pos == "":
-                pos = None
-            else:
-                pos = int(pos)
+        pos = self.scoreboard_poller.snapshot.ranks.get(full_team.id)
+        if pos is None and full_team.place is not None:
+            place = re.sub("[^0-9]", "", full_team.place)
+            if place != "":
+                pos = int(place)
 
         await interaction.followup.send(
             ephemeral=True,
@@ -292,12 +318,10 @@ class CtfD(commands.Cog):
 
     @team.autocomplete("team")
     async def team_autocomplete(self, _interaction: discord.Interaction, current: str):
-        filtered = [
-            app_commands.Choice(name=team.name, value=team.name)
-            for team in await self.ctfd_api.get_teams()
-            if current.lower() in team.name.lower()
+        return [
+            app_commands.Choice(name=name, value=name)
+            for name in await self.ctfd_api.search_teams(current, 25)
         ]
-        return filtered[:25]
 
     @app_commands.command(name="register", description="Register for the CTF.")
     @app_commands.checks.cooldown(1, REGISTER_COOLDOWN)
@@ -309,7 +333,15 @@ class CtfD(commands.Cog):
             )
             return
 
-        await interaction.response.defer(thinking=True, ephemeral=True)
+        if not self.client.owns_first_shard:
+            # the DMs below would be delivered to whichever process runs shard 0
+            await interaction.response.send_message(
+                "Please send me /register in a DM to create your account.",
+                ephemeral=True,
+            )
+            return
+
+        await defer(interaction, thinking=True, ephemeral=True)
 
         user = await self.ctfd_api.get_user_from_discord(interaction.user.id)
         if user is not None:
@@ -0,0 +1,58 @@
+import asyncio
+import signal
+
+import dotenv
+from loguru import logger
+
+from ctfd_discord_bot.utils.ctfd_api import CTFd_API
+from ctfd_discord_bot.utils.environment import Config, PollerMode
+from ctfd_discord_bot.utils.log import setup_logging
+from ctfd_discord_bot.utils.metrics import start_metrics_server
+
+
+async def async_main(config: Config):
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop.set)
+        except NotImplementedError:
+            # Windows, where Ctrl+C still raises KeyboardInterrupt instead
+            pass
+
+    metrics_runner = None
+    if config.poller_metrics_port != 0:
+        metrics_runner = await start_metrics_server(
+            config.metrics_host, config.poller_metrics_port
+        )
+
+    ctfd_api = CTFd_API(config)
+    logger.success("Started polling CTFd for new solves.")
+
+    try:
+        await stop.wait()
+    finally:
+        logger.info("Stopping the solve poller.")
+        await ctfd_api.close()
+
+        if metrics_runner is not None:
+            await metrics_runner.cleanup()
+
+
+def main():
+    dotenv.load_dotenv()
+    config = Config()
+    setup_logging(config, prefix="poller-")
+
+    if config.poller_mode != PollerMode.EXTERNAL:
+        # the poller lease still keeps solves from being announced twice
+        logger.warning(
+            "POLLER_MODE is not external, so the bot may poll for solves instead of"
+            " this process, whichever of them holds the poller lease."
+        )
+
+    asyncio.run(async_main(config))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+import time
+from collections import OrderedDict
+from collections.abc import Hashable, Iterable
+from dataclasses import dataclass
+
+
+@dataclass(slots=True)
+class CacheEntry[V]:
+    value: V
+    expires_at: float  # time.monotonic() timestamp
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    stale_hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.stale_hits + self.misses
+        return 0.0 if lookups == 0 else (self.hits + self.stale_hits) / lookups
+
+    def __str__(self) -> str:
+        return (
+            f"{self.hits} hits, {self.stale_hits} stale hits, {self.misses} misses,"
+            f" {self.evictions} evictions ({self.hit_ratio:.1%} hit ratio)"
+        )
+
+
+class TTLCache[K: Hashable, V]:
+    """A bounded mapping whose entries expire after a TTL.
+
+    Once `maxsize` entries are stored, the least recently used entry is evicted.
+    Expired entries are kept for a further `stale_ttl` seconds, during which
+    `get_stale` still returns them so that callers can serve stale data while
+    revalidating.
+    """
+
+    maxsize: int
+    ttl: float
+    stale_ttl: float
+    entries: OrderedDict[K, CacheEntry[V]]
+    stats: CacheStats
+
+    def __init__(self, maxsize: int, ttl: float, *, stale_ttl: float = 0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.entries = OrderedDict()
+        self.stats = CacheStats()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __contains__(self, key: K) -> bool:
+        return self._get_entry(key) is not None
+
+    def _get_entry(self, key: K, *, allow_stale: bool = False) -> CacheEntry[V] | None:
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+
+        now = time.monotonic()
+        if entry.expires_at + self.stale_ttl <= now:
+            del self.entries[key]
+            return None
+
+        if not allow_stale and entry.expires_at <= now:
+            return None
+
+        self.entries.move_to_end(key)
+        return entry
+
+    def get(self, key: K) -> V | None:
+        entry = self._get_entry(key)
+        if entry is None:
+            self.stats.misses += 1
+            return None
+
+        self.stats.hits += 1
+        return entry.value
+
+    def get_stale(self, key: K) -> tuple[V, bool] | None:
+        """Returns the value for `key` and whether it is still fresh."""
+        entry = self._get_entry(key, allow_stale=True)
+        if entry is None:
+            self.stats.misses += 1
+            return None
+
+        fresh = entry.expires_at > time.monotonic()
+        if fresh:
+            self.stats.hits += 1
+        else:
+            self.stats.stale_hits += 1
+
+        return (entry.value, fresh)
+
+    def set(self, key: K, value: V, ttl: float | None = None):
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        self.entries[key] = CacheEntry(value, expires_at)
+        self.entries.move_to_end(key)
+
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+            self.stats.evictions += 1
+
+    def pop(self, key: K) -> V | None:
+        entry = self.entries.pop(key, None)
+        return None if entry is None else entry.value
+
+    def discard_many(self, keys: Iterable[K]) -> int:
+        """Removes every given key, returning how many were present."""
+        removed = 0
+        for key in keys:
+            if self.entries.pop(key, None) is not None:
+                removed += 1
+
+        return removed
+
+    def clear(self):
+        self.entries.clear()
@@ -0,0 +1,154 @@
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from types import MappingProxyType
+
+from loguru import logger
+
+from ctfd_discord_bot.utils.ctfd_api import Challenge, CTFd_API
+from ctfd_discord_bot.utils.refresher import Refresher
+
+
+@dataclass(frozen=True, slots=True)
+class CatalogSnapshot:
+    """An immutable view of the challenge list at one point in time."""
+
+    # Incremented whenever anything shown to users changes
+    version: int
+    # Incremented only when challenges are added, removed, edited or reordered,
+    # and not when just their solve counts change
+    layout_version: int
+    challenges: Mapping[int, Challenge]
+    # Category names mapped to their challenges, both in CTFd's order
+    categories: Mapping[str, tuple[Challenge, ...]]
+
+    @property
+    def total(self) -> int:
+        return len(self.challenges)
+
+    @classmethod
+    def build(
+        cls, version: int, layout_version: int, challenges: Iterable[Challenge]
+    ) -> "CatalogSnapshot":
+        by_id: dict[int, Challenge] = {}
+        categories: dict[str, list[Challenge]] = {}
+        for challenge in challenges:
+            by_id[challenge.id] = challenge
+            categories.setdefault(challenge.category, []).append(challenge)
+
+        return cls(
+            version,
+            layout_version,
+            MappingProxyType(by_id),
+            MappingProxyType(
+                {category: tuple(items) for category, items in categories.items()}
+            ),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class CatalogDiff:
+    added: list[Challenge]
+    removed: list[Challenge]
+    # challenges whose name, value or category changed
+    changed: list[Challenge]
+    # challenges whose solve count changed
+    solved: list[Challenge]
+
+    def __bool__(self) -> bool:
+        return self.layout_changed or bool(self.solved)
+
+    @property
+    def layout_changed(self) -> bool:
+        return bool(self.added or self.removed or self.changed)
+
+
+def diff_catalogs(old: CatalogSnapshot, new: CatalogSnapshot) -> CatalogDiff:
+    added: list[Challenge] = []
+    changed: list[Challenge] = []
+    solved: list[Challenge] = []
+
+    for challenge_id, challenge in new.challenges.items():
+        previous = old.challenges.get(challenge_id)
+        if previous is None:
+            added.append(challenge)
+        elif (previous.name, previous.value, previous.category) != (
+            challenge.name,
+            challenge.value,
+            challenge.category,
+        ):
+            changed.append(challenge)
+        elif previous.solves != challenge.solves:
+            solved.append(challenge)
+
+    removed = [
+        challenge
+        for challenge_id, challenge in old.challenges.items()
+        if challenge_id not in new.challenges
+    ]
+
+    # a reordered list changes what is shown too
+    if not (added or removed or changed) and list(old.challenges) != list(
+        new.challenges
+    ):
+        changed = list(new.challenges.values())
+
+    return CatalogDiff(added, removed, changed, solved)
+
+
+class ChallengeCatalog(Refresher):
+    """Keeps the challenge list in memory, refreshing it in the background.
+
+    Each refresh builds a new snapshot and swaps it in with a single assignment,
+    so readers should take `snapshot` once and use that for the whole command.
+    """
+
+    ctfd_api: CTFd_API
+    snapshot: CatalogSnapshot
+
+    def __init__(self, ctfd_api: CTFd_API, *, interval: int):
+        super().__init__("Catalog", interval=interval)
+        self.ctfd_api = ctfd_api
+        self.snapshot = CatalogSnapshot.build(0, 0, [])
+
+    async def start(self):
+        await super().start()
+        logger.success(
+            f"Cached {self.snapshot.total} challenges in"
+            f" {len(self.snapshot.categories)} categories at startup."
+        )
+
+    async def refresh(self) -> CatalogDiff:
+        challenges = await self.ctfd_api.get_challenges(invalidate_cache=True)
+
+        current = self.snapshot
+        new = CatalogSnapshot.build(current.version, current.layout_version, challenges)
+        diff = diff_catalogs(current, new)
+        if not diff:
+            return diff
+
+        layout_version = current.layout_version
+        if diff.layout_changed:
+            layout_version += 1
+
+        self.snapshot = CatalogSnapshot(
+            current.version + 1,
+            layout_version,
+            new.challenges,
+            new.categories,
+        )
+        if current.total == 0:
+            # the initial load, every challenge would be logged as added
+            return diff
+
+        for challenge in diff.added:
+            logger.info(f"[Catalog] Added {challenge.category}/{challenge.name}.")
+        for challenge in diff.removed:
+            logger.info(f"[Catalog] Removed {challenge.category}/{challenge.name}.")
+        if diff.changed:
+            logger.info(f"[Catalog] Updated {len(diff.changed)} challenges.")
+        if diff.solved:
+            logger.debug(
+                f"[Catalog] Solve counts changed on {len(diff.solved)} challenges."
+            )
+
+        return diff
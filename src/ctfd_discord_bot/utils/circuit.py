@@ -0,0 +1,76 @@
+import time
+from enum import StrEnum
+
+from loguru import logger
+
+
+class CircuitState(StrEnum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+
+class CircuitBreaker:
+    """Stops sending requests to a server that keeps failing.
+
+    After `failure_threshold` consecutive failures the circuit opens and every
+    request is refused for `reset_timeout` seconds. A single probe request is then
+    let through, closing the circuit if it succeeds and reopening it otherwise.
+    A `failure_threshold` of 0 disables the breaker.
+    """
+
+    name: str
+    failure_threshold: int
+    reset_timeout: float
+    state: CircuitState
+    failures: int
+    # time.monotonic() timestamp of when the circuit opened or the last probe was sent
+    opened_at: float
+
+    def __init__(self, name: str, *, failure_threshold: int, reset_timeout: float):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CircuitState.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+
+    def allow(self) -> bool:
+        """Returns whether a request may be sent now."""
+        if self.state == CircuitState.CLOSED:
+            return True
+
+        # a probe that never reported back is replaced after another reset_timeout
+        now = time.monotonic()
+        if now - self.opened_at >= self.reset_timeout:
+            self.state = CircuitState.HALF_OPEN
+            self.opened_at = now
+            return True
+
+        # open, or half-open with the probe still in flight
+        return False
+
+    def record_success(self):
+        if self.state != CircuitState.CLOSED:
+            logger.info(f"[{self.name}] Circuit closed, requests resumed.")
+
+        self.state = CircuitState.CLOSED
+        self.failures = 0
+
+    def record_failure(self):
+        self.failures += 1
+        if self.failure_threshold == 0:
+            return
+
+        if (
+            self.state == CircuitState.HALF_OPEN
+            or self.failures >= self.failure_threshold
+        ):
+            if self.state != CircuitState.OPEN:
+                logger.warning(
+                    f"[{self.name}] Circuit opened after {self.failures} failures,"
+                    f" pausing requests for {self.reset_timeout}s."
+                )
+
+            self.state = CircuitState.OPEN
+            self.opened_at = time.monotonic()
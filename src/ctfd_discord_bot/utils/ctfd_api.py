@@ -1,17 +1,84 @@
 import asyncio
-import datetime
+import contextlib
+import email.utils
+import os
+import random
+import socket
+import time
+from collections.abc import AsyncGenerator, Awaitable, Callable, Sequence
 from dataclasses import dataclass, field
+from types import SimpleNamespace
 from typing import TYPE_CHECKING, Any, Literal
 
-import typedload
-from aiohttp import ClientSession, ClientTimeout
+import aiohttp
+from aiohttp import ClientSession, ClientTimeout, TCPConnector, TraceConfig
 from loguru import logger
 
-from ctfd_discord_bot.utils.environment import Config
-from ctfd_discord_bot.utils.errors import CTFdError
-
-
-@dataclass
+from ctfd_discord_bot.utils import metrics
+from ctfd_discord_bot.utils.cache import TTLCache
+from ctfd_discord_bot.utils.circuit import CircuitBreaker
+from ctfd_discord_bot.utils.decoding import Decoder, get_decoder
+from ctfd_discord_bot.utils.environment import Config, WebhookMode
+from ctfd_discord_bot.utils.errors import (
+    CTFdError,
+    CTFdHTTPError,
+    CTFdNotFoundError,
+    CTFdUnavailableError,
+)
+from ctfd_discord_bot.utils.lazy import concat
+from ctfd_discord_bot.utils.schedule import AdaptiveSchedule
+from ctfd_discord_bot.utils.state import StateStore
+from ctfd_discord_bot.utils.team_index import TeamIndex
+from ctfd_discord_bot.utils.webhook import WebhookSender
+
+# CTFd always serves users 50 to a page
+USERS_PER_PAGE = 50
+# CTFd caps per_page at 100
+SUBMISSIONS_PER_PAGE = 100
+# Waiting this many seconds for a pooled connection is logged as a warning
+POOL_WAIT_WARNING = 1
+# Statuses that mean CTFd or its proxy is overloaded, so a GET can safely be retried
+RETRY_STATUSES = frozenset((429, 502, 503, 504))
+# The state store lease held by whichever process is polling for new solves
+POLLER_LEASE = "poller"
+
+REQUEST_SECONDS = metrics.histogram(
+    "ctfd_request_duration_seconds",
+    "Latency of each attempt at a CTFd API request.",
+    ["method", "endpoint"],
+)
+REQUEST_FAILURES = metrics.counter(
+    "ctfd_request_failures",
+    "CTFd API request attempts that failed, by error.",
+    ["method", "endpoint", "error"],
+)
+REQUESTS_COALESCED = metrics.counter(
+    "ctfd_requests_coalesced",
+    "GETs served by an identical request already in flight.",
+    ["endpoint"],
+)
+REQUESTS_IN_FLIGHT = metrics.gauge(
+    "ctfd_requests_in_flight", "CTFd API requests awaiting a response."
+)
+POOL_WAIT_SECONDS = metrics.histogram(
+    "ctfd_pool_wait_seconds", "Time spent waiting for a pooled connection to CTFd."
+)
+CACHE_HIT_RATIO = metrics.gauge(
+    "cache_hit_ratio", "Share of cache lookups served from the cache.", ["cache"]
+)
+CACHE_ENTRIES = metrics.gauge("cache_entries", "Entries held in a cache.", ["cache"])
+WEBHOOK_CYCLE_SECONDS = metrics.histogram(
+    "webhook_cycle_duration_seconds",
+    "Time taken by each webhook poll for new solves.",
+    ["mode"],
+    buckets=(0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120),
+)
+WEBHOOK_INTERVAL_SECONDS = metrics.gauge(
+    "webhook_interval_seconds", "Current interval between webhook polls."
+)
+
+
+@dataclass(slots=True)
 class Member:
     bracket_id: int | None
     bracket_name: str | None
@@ -21,7 +88,7 @@ class Member:
     score: int | None
 
 
-@dataclass
+@dataclass(slots=True)
 class Score:
     pos: int | None
     account_id: int
@@ -32,10 +99,10 @@ class Score:
     score: int
     bracket_id: int | None
     bracket_name: str | None
-    members: list[Member]
+    members: Sequence[Member]
 
 
-@dataclass
+@dataclass(slots=True)
 class Challenge:
     id: int
     type: str
@@ -49,7 +116,7 @@ class Challenge:
     script: str
 
 
-@dataclass
+@dataclass(slots=True)
 class UserField:
     value: str | bool
     field_id: int
@@ -58,7 +125,7 @@ class UserField:
     name: str
 
 
-@dataclass
+@dataclass(slots=True)
 class User:
     affiliation: str | None
     team_id: int | None
@@ -69,12 +136,17 @@ class User:
     name: str
     website: str | None
     country: str | None
+    # custom fields indexed by field_id, built once when decoded
+    fields_by_id: dict[int, UserField] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.fields_by_id = {field.field_id: field for field in self.fields}
 
     def get_field(self, field_id: int) -> UserField | None:
-        return next(filter(lambda field: field.field_id == field_id, self.fields), None)
+        return self.fields_by_id.get(field_id)
 
 
-@dataclass
+@dataclass(slots=True)
 class FullUser(User):
     change_password: bool
     language: str | None
@@ -88,7 +160,7 @@ class FullUser(User):
     score: int | None = field(default=None)
 
 
-@dataclass
+@dataclass(slots=True)
 class RequestPagination:
     page: int
     next: int | None
@@ -97,7 +169,7 @@ class RequestPagination:
     total: int
 
 
-@dataclass
+@dataclass(slots=True)
 class Team:
     id: int
     banned: bool
@@ -115,21 +187,21 @@ class Team:
     captain_id: int
 
 
-@dataclass
+@dataclass(slots=True)
 class FullTeam(Team):
     members: list[int]
     place: str | None
     score: int
 
 
-@dataclass
+@dataclass(slots=True)
 class SolveStatistics:
     id: int
     name: str
     solves: int
 
 
-@dataclass
+@dataclass(slots=True)
 class ChallengeSolve:
     account_id: int
     name: str
@@ -137,13 +209,13 @@ class ChallengeSolve:
     account_url: str
 
 
-@dataclass
+@dataclass(slots=True)
 class TeamSolveUser:
     name: str
     id: int
 
 
-@dataclass
+@dataclass(slots=True)
 class TeamSolveChallenge:
     name: str
     category: str
@@ -151,13 +223,13 @@ class TeamSolveChallenge:
     value: int
 
 
-@dataclass
+@dataclass(slots=True)
 class TeamSolveTeam:
     name: str
     id: int
 
 
-@dataclass
+@dataclass(slots=True)
 class TeamSolve:
     user: TeamSolveUser
     ip: str
@@ -170,7 +242,21 @@ class TeamSolve:
     type: str
 
 
-# typedload cannot deal with generics since all types must be fully qualified at runtime,
+@dataclass(slots=True)
+class Submission:
+    id: int
+    challenge_id: int
+    challenge: TeamSolveChallenge
+    user: TeamSolveUser
+    team: TeamSolveTeam | None
+    date: str  # javascript Date
+    type: str
+
+
+# Large list endpoints are typed as Sequence, which the decoder loads lazily since
+# callers usually only read a handful of the items.
+
+# The decoder cannot deal with generics since all types must be fully qualified at runtime,
 # so this is a workaround to allow for generics while having fully qualified types at runtime.
 
 
@@ -194,7 +280,7 @@ def create_request_type[T](data_ty: type[T]) -> type[Request[T]]:
 
         def get_pagination(self) -> RequestPagination | None:
             if self.meta is not None and "pagination" in self.meta:
-                return typedload.load(self.meta["pagination"], RequestPagination)
+                return get_decoder().load(self.meta["pagination"], RequestPagination)
             return None
 
     Request.__annotations__["data"] = data_ty
@@ -202,43 +288,271 @@ def create_request_type[T](data_ty: type[T]) -> type[Request[T]]:
     return Request  # type: ignore
 
 
-ScoresRequest = create_request_type(list[Score])
+ScoresRequest = create_request_type(Sequence[Score])
 ChallengesRequest = create_request_type(list[Challenge])
-UsersRequest = create_request_type(list[User])
+UsersRequest = create_request_type(Sequence[User])
 FullUserRequest = create_request_type(FullUser)
-TeamsRequest = create_request_type(list[Team])
+TeamsRequest = create_request_type(Sequence[Team])
 FullTeamRequest = create_request_type(FullTeam)
 SolveStatisticsRequest = create_request_type(list[SolveStatistics])
 ChallengeSolvesRequest = create_request_type(list[ChallengeSolve])
 TeamSolvesRequest = create_request_type(list[TeamSolve])
+SubmissionsRequest = create_request_type(list[Submission])
+
+
+@dataclass
+class RequestStats:
+    issued: int = 0
+    # GETs that were served by awaiting an identical request already in flight
+    coalesced: int = 0
+    # Requests that had to wait for a free connection in the pool, and for how long
+    pool_waits: int = 0
+    pool_wait_time: float = 0.0
+    max_pool_wait: float = 0.0
+
+
+@dataclass(slots=True)
+class WebhookPoll:
+    """What one webhook poll found, applied only once its solves are announced."""
+
+    # (user_id, challenge_name) pairs to announce, oldest first
+    solves: list[tuple[int, str]]
+    # (challenge_id, account_id) pairs seen for the first time
+    seen: list[tuple[int, int]] = field(default_factory=list)
+    # The submissions watermark to resume from next time
+    submissions_watermark: dict[str, int] | None = None
+
+
+def paged_endpoint(endpoint: str, page: int) -> str:
+    separator = "&" if "?" in endpoint else "?"
+    return f"{endpoint}{separator}page={page}"
+
+
+def endpoint_label(endpoint: str) -> str:
+    """Collapses IDs and query strings so each endpoint is a single metric label."""
+    path = endpoint.partition("?")[0]
+    return "/".join(":id" if part.isdigit() else part for part in path.split("/"))
+
+
+def parse_retry_after(value: str) -> float | None:
+    """Parses a Retry-After header, given either in seconds or as an HTTP date."""
+    try:
+        return max(float(value), 0)
+    except ValueError:
+        pass
+
+    try:
+        date = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+    return max(date.timestamp() - time.time(), 0)
+
+
+def is_transient(exc: BaseException) -> bool:
+    """Returns whether `exc` means CTFd is struggling, rather than the request being bad."""
+    if isinstance(exc, CTFdHTTPError):
+        return exc.status in RETRY_STATUSES or exc.status >= 500
+
+    return isinstance(exc, (CTFdUnavailableError, aiohttp.ClientError, TimeoutError))
 
 
 class CTFd_API:
     session: ClientSession
     config: Config
+    decoder: Decoder
+    state: StateStore
+
+    # Maps Discord user IDs to CTFd user IDs, persisted in the state store
+    discord_id_cache: dict[int, int]
+    # The last user ID scanned into the discord ID cache, and the page to resume from
+    users_watermark: dict[str, int]
+    # time.monotonic() timestamp of the last scan of every user
+    last_full_scan: float | None = None
+    refresh_lock: asyncio.Lock
+    # Discord IDs recently found not to have a CTFd user
+    missing_discord_ids: TTLCache[int, bool]
+    # CTFd user IDs recently found not to have a Discord ID
+    unlinked_users: TTLCache[int, bool]
+    # Maps cache keys (usually the endpoint) to decoded responses
+    response_cache: TTLCache[str, Any]
+    background_refreshes: dict[str, asyncio.Task[None]]
+    user_cache: TTLCache[int, FullUser]
+    # Indexes the names of the teams last fetched by get_teams
+    team_index: TeamIndex
+    # Maps challenge IDs to the accounts that solved them, persisted in the state store
+    challenge_solves: dict[int, set[int]]
+    # (challenge_id, account_id) pairs seen since the state store was last flushed
+    unflushed_solves: list[tuple[int, int]]
+    # The last correct submission ID announced, and how many correct submissions exist
+    submissions_watermark: dict[str, int] | None
+    # Set while the first poll after a restart replays the solves missed during downtime
+    catching_up: bool
+    # Decides when the next webhook poll is due
+    webhook_schedule: AdaptiveSchedule
+    # Identifies this process to others sharing the state store
+    lease_owner: str
+    # Whether this process holds the poller lease, None before it first tries
+    holds_poller_lease: bool | None = None
+    # time.monotonic() timestamp of when the poller lease was last taken or renewed
+    lease_renewed: float = 0
+    webhook_sender: WebhookSender | None = None
+    webhook_task: asyncio.Task[None] | None = None
+    in_flight: dict[tuple[str, str], asyncio.Task[Any]]
+    # Bounds the CTFd requests made by each webhook poll
+    webhook_semaphore: asyncio.Semaphore
+    request_stats: RequestStats
+    circuit: CircuitBreaker
+
+    def __init__(self, config: Config, *, webhook: bool = True):
+        self.config = config
+        self.decoder = get_decoder(trusted=config.trusted_decoding)
+        self.in_flight = {}
+        self.webhook_semaphore = asyncio.Semaphore(max(config.webhook_concurrency, 1))
+        self.request_stats = RequestStats()
+        self.circuit = CircuitBreaker(
+            "CTFd API",
+            failure_threshold=config.circuit_failure_threshold,
+            reset_timeout=config.circuit_reset_timeout,
+        )
+        self.state = StateStore(config.state_path)
+        self.discord_id_cache = self.state.load_discord_users()
+        self.users_watermark = self.state.get_meta(
+            "users_watermark", {"user_id": 0, "page": 1}
+        )
+        self.refresh_lock = asyncio.Lock()
+        self.missing_discord_ids = TTLCache(
+            config.negative_cache_size, config.negative_cache_timeout
+        )
+        self.unlinked_users = TTLCache(
+            config.negative_cache_size, config.negative_cache_timeout
+        )
+        self.response_cache = TTLCache(
+            config.cache_size,
+            config.cache_timeout,
+            stale_ttl=config.cache_stale_timeout,
+        )
+        self.background_refreshes = {}
+        self.user_cache = TTLCache(config.user_cache_size, config.user_cache_timeout)
+        self.team_index = TeamIndex()
+
+        for name, cache in (
+            ("response", self.response_cache),
+            ("user", self.user_cache),
+            ("missing_discord_id", self.missing_discord_ids),
+            ("unlinked_user", self.unlinked_users),
+        ):
+            CACHE_HIT_RATIO.set_function(
+                lambda cache=cache: cache.stats.hit_ratio, cache=name
+            )
+            CACHE_ENTRIES.set_function(lambda cache=cache: len(cache), cache=name)
+
+        # loaded once this process takes the poller lease, since only the poller needs them
+        self.challenge_solves = {}
+        self.unflushed_solves = []
+        self.submissions_watermark = None
+        self.catching_up = False
+        self.lease_owner = f"{socket.gethostname()}:{os.getpid()}"
+        if config.webhook_frequency > config.webhook_max_frequency:
+            logger.warning(
+                f"[Webhook Task] WEBHOOK_FREQUENCY is above WEBHOOK_MAX_FREQUENCY,"
+                f" checking for new solves every {config.webhook_max_frequency}s instead."
+            )
+        self.webhook_schedule = AdaptiveSchedule(
+            config.webhook_frequency,
+            min_interval=config.webhook_min_frequency,
+            max_interval=config.webhook_max_frequency,
+        )
+        WEBHOOK_INTERVAL_SECONDS.set_function(lambda: self.webhook_schedule.interval)
+        logger.info(
+            f"Loaded {len(self.discord_id_cache)} Discord users from the state store."
+        )
 
-    # Maps Discord user IDs to CTFd user IDs
-    discord_id_cache: dict[int, int] = {}
-    teams_cache_time: datetime.datetime = datetime.datetime(1970, 1, 1)
-    teams_cache: list[Team] = []
-    user_count = 0
-    challenge_solves: dict[int, set[int]] = {}
+        trace_config = TraceConfig()
+        trace_config.on_connection_queued_start.append(self._on_pool_wait_start)
+        trace_config.on_connection_queued_end.append(self._on_pool_wait_end)
 
-    def __init__(self, config: Config):
-        self.config = config
         self.session = ClientSession(
             f"{config.ctfd_instance_url}/api/v1/",
-            timeout=ClientTimeout(total=config.api_timeout),
+            connector=TCPConnector(
+                limit=config.api_pool_size,
+                limit_per_host=config.api_pool_per_host,
+                keepalive_timeout=config.api_keepalive_timeout,
+                ttl_dns_cache=config.api_dns_cache_ttl,
+            ),
+            timeout=ClientTimeout(
+                total=config.api_timeout,
+                sock_connect=config.api_connect_timeout or None,
+                sock_read=config.api_read_timeout or None,
+            ),
+            trace_configs=[trace_config],
             headers={
                 "Authorization": f"Token {config.ctfd_access_token}",
                 "Content-Type": "application/json",
             },
         )
 
-        self._webhook_manager()
+        if webhook:
+            self.webhook_sender = WebhookSender(
+                config.webhook_url, timeout=config.api_timeout
+            )
+            self._webhook_manager()
 
     async def close(self):
+        if self.webhook_task is not None:
+            self.webhook_task.cancel()
+
+        if self.holds_poller_lease:
+            # lets another process take over without waiting for the lease to expire
+            self.state.release_lease(POLLER_LEASE, self.lease_owner)
+
+        if self.webhook_sender is not None:
+            await self.webhook_sender.close()
+
+        for task in self.background_refreshes.values():
+            task.cancel()
+
         await self.session.close()
+        self.state.close()
+
+        logger.info(f"Response cache: {self.response_cache.stats}")
+        logger.info(f"User cache: {self.user_cache.stats}")
+
+        stats = self.request_stats
+        logger.info(
+            f"Issued {stats.issued} CTFd requests,"
+            f" coalesced {stats.coalesced} duplicate GETs."
+        )
+        if stats.pool_waits != 0:
+            logger.info(
+                f"{stats.pool_waits} requests waited for a pooled connection,"
+                f" {stats.pool_wait_time / stats.pool_waits:.3f}s on average"
+                f" and {stats.max_pool_wait:.3f}s at most."
+            )
+
+    async def _on_pool_wait_start(
+        self, _session: ClientSession, context: SimpleNamespace, _params: Any
+    ):
+        context.pool_wait_started = time.monotonic()
+        logger.debug(
+            f"[CTFd API] Connection pool saturated ({self.config.api_pool_size} total,"
+            f" {self.config.api_pool_per_host} per host), waiting for a connection."
+        )
+
+    async def _on_pool_wait_end(
+        self, _session: ClientSession, context: SimpleNamespace, _params: Any
+    ):
+        waited = time.monotonic() - context.pool_wait_started
+        self.request_stats.pool_waits += 1
+        self.request_stats.pool_wait_time += waited
+        self.request_stats.max_pool_wait = max(self.request_stats.max_pool_wait, waited)
+        POOL_WAIT_SECONDS.observe(waited)
+
+        if waited >= POOL_WAIT_WARNING:
+            logger.warning(
+                f"[CTFd API] Waited {waited:.2f}s for a pooled connection,"
+                " consider raising API_POOL_SIZE or API_POOL_PER_HOST."
+            )
 
     async def _parse_request[T](
         self,
@@ -248,107 +562,395 @@ class CTFd_API:
         *,
         json: dict[str, Any] = {},
     ) -> T:
-        response = await self.session.request(method, endpoint, json=json)
-        if response.status != 200:
-            raise CTFdError(f"Non-200 status code: {response.status} {response.reason}")
+        if method != "GET":
+            return await self._send_request(method, endpoint, ty, json=json)
+
+        # Identical concurrent GETs all await the same in-flight request
+        key = (method, endpoint)
+        task = self.in_flight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._send_request(method, endpoint, ty))
+            self.in_flight[key] = task
+            task.add_done_callback(lambda task: self._request_done(key, task))
+        else:
+            self.request_stats.coalesced += 1
+            REQUESTS_COALESCED.inc(endpoint=endpoint_label(endpoint))
+
+        # shielded so a cancelled caller doesn't cancel the request for everyone else
+        return await asyncio.shield(task)
+
+    def _request_done(self, key: tuple[str, str], task: asyncio.Task[Any]):
+        if self.in_flight.get(key) is task:
+            del self.in_flight[key]
+
+        # mark the exception as retrieved in case every caller was cancelled
+        if not task.cancelled():
+            task.exception()
+
+    async def _send_request[T](
+        self,
+        method: Literal["GET", "POST", "PATCH", "DELETE"],
+        endpoint: str,
+        ty: type[T],
+        *,
+        json: dict[str, Any] = {},
+    ) -> T:
+        if not self.circuit.allow():
+            raise CTFdUnavailableError("CTFd is unavailable, try again later.")
+
+        # only GETs are idempotent, anything else might be applied twice
+        attempts = self.config.api_max_retries + 1 if method == "GET" else 1
+        labels = {"method": method, "endpoint": endpoint_label(endpoint)}
+        value: Any = None
+        for attempt in range(attempts):
+            self.request_stats.issued += 1
+            retry_after: float | None = None
+
+            try:
+                with REQUEST_SECONDS.time(**labels), REQUESTS_IN_FLIGHT.track():
+                    async with self.session.request(
+                        method, endpoint, json=json
+                    ) as response:
+                        if response.status == 404:
+                            raise CTFdNotFoundError(response.status, response.reason)
+
+                        if response.status != 200:
+                            if "Retry-After" in response.headers:
+                                retry_after = parse_retry_after(
+                                    response.headers["Retry-After"]
+                                )
+
+                            raise CTFdHTTPError(response.status, response.reason)
+
+                        value = await response.json()
+            except (CTFdHTTPError, aiohttp.ClientError, TimeoutError) as exc:
+                REQUEST_FAILURES.inc(**labels, error=type(exc).__name__)
+                retryable = (
+                    not isinstance(exc, CTFdHTTPError) or exc.status in RETRY_STATUSES
+                ) and (
+                    # retrying before CTFd asked would only earn another 429
+                    retry_after is None or retry_after <= self.config.api_max_backoff
+                )
+                if not retryable or attempt == attempts - 1:
+                    if is_transient(exc):
+                        self.circuit.record_failure()
+                    else:
+                        self.circuit.record_success()
+
+                    raise
+
+                delay = retry_after
+                if delay is None:
+                    delay = min(
+                        self.config.api_retry_backoff
+                        * 2**attempt
+                        * random.uniform(0.5, 1.5),
+                        self.config.api_max_backoff,
+                    )
+
+                logger.warning(
+                    f"[CTFd API] {type(exc).__name__} on {method} {endpoint}: {exc},"
+                    f" retrying in {delay:.1f}s."
+                )
+                await asyncio.sleep(delay)
+                continue
+
+            self.circuit.record_success()
+            break
 
-        value = await response.json()
         if "message" in value:
             raise CTFdError(f"CTFd error: {value['message']}")
 
         if "success" in value and not value["success"]:
             raise CTFdError("CTFd request failed.")
 
-        return typedload.load(value, ty)
+        return self.decoder.load(value, ty)
+
+    async def _paginate[T](
+        self, endpoint: str, ty: type[Request[T]], *, start_page: int = 1
+    ) -> AsyncGenerator[Request[T]]:
+        """Yields every page of a paginated endpoint in order, from `start_page` on.
+
+        The first page is fetched on its own to read the page count, then the
+        remaining pages are fetched concurrently, at most `api_concurrency` at a time.
+        """
+        first = await self._parse_request(
+            "GET", paged_endpoint(endpoint, start_page), ty
+        )
+
+        pagination = first.get_pagination()
+        if pagination is None:
+            raise CTFdError(f"{endpoint.capitalize()} endpoint was not paginated.")
+
+        yield first
+
+        semaphore = asyncio.Semaphore(max(self.config.api_concurrency, 1))
+
+        async def fetch_page(page: int) -> Request[T]:
+            async with semaphore:
+                return await self._parse_request(
+                    "GET", paged_endpoint(endpoint, page), ty
+                )
+
+        tasks = [
+            asyncio.create_task(fetch_page(page))
+            for page in range(start_page + 1, pagination.pages + 1)
+        ]
+
+        try:
+            for task in tasks:
+                yield await task
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _refresh_cache(self, *, full: bool = False):
+        """Scans the users past the watermark for new Discord IDs.
+
+        User IDs only ever increase, but hiding, banning or deleting a user moves
+        every later user back, so the scan starts a page before the watermark's and
+        rewinds further if that page already holds only unseen users. A `full` scan
+        starts from the first page and also picks up Discord IDs added to users
+        already scanned.
+        """
+        async with self.refresh_lock:
+            last_user_id = self.users_watermark["user_id"]
+            page_num = 1 if full else max(self.users_watermark["page"] - 1, 1)
+            found: list[tuple[int, int]] = []
+            if page_num == 1:
+                self.last_full_scan = time.monotonic()
+
+            rewind = True
+            while rewind:
+                rewind = False
+                start_page = page_num
+                async with contextlib.aclosing(
+                    self._paginate("users", UsersRequest, start_page=page_num)
+                ) as pages:
+                    async for page in pages:
+                        pagination = page.get_pagination()
+                        if pagination is None:
+                            continue
+
+                        if (
+                            pagination.page == start_page
+                            and start_page > 1
+                            and (len(page.data) == 0 or page.data[0].id > last_user_id)
+                        ):
+                            # users scanned before may have moved past this page
+                            rewind = True
+                            page_num = min(pagination.page - 1, pagination.pages)
+                            break
+
+                        for user in page.data:
+                            if user.id <= last_user_id and not full:
+                                continue
+
+                            last_user_id = max(last_user_id, user.id)
+                            discord_id = user.get_field(self.config.discord_id_field)
+                            if discord_id is None or discord_id.value == "":
+                                continue
+
+                            found.append((int(discord_id.value), user.id))
+
+                        # a partially filled page must be rescanned for new users next time
+                        page_num = pagination.page
+                        if len(page.data) >= USERS_PER_PAGE:
+                            page_num += 1
+
+            self.users_watermark = {"user_id": last_user_id, "page": page_num}
+            self.discord_id_cache.update(found)
+            self.missing_discord_ids.discard_many(discord_id for discord_id, _ in found)
+            self.state.add_discord_users(found, watermark=self.users_watermark)
+
+    def _full_scan_due(self) -> bool:
+        interval = self.config.users_rescan_interval
+        return interval != 0 and (
+            self.last_full_scan is None
+            or time.monotonic() - self.last_full_scan >= interval
+        )
+
+    async def _cached[T](
+        self,
+        key: str,
+        ttl: int,
+        fetch: Callable[[], Awaitable[T]],
+        *,
+        invalidate_cache: bool = False,
+    ) -> T:
+        """Returns the cached value for `key`, calling `fetch` on a miss.
+
+        Stale values are returned immediately while a single background task
+        refreshes them, and keep being served for as long as CTFd is unreachable.
+        """
+        if not invalidate_cache:
+            cached = self.response_cache.get_stale(key)
+            if cached is not None:
+                value, fresh = cached
+                if not fresh and key not in self.background_refreshes:
+                    task = asyncio.create_task(
+                        self._refresh_entry(key, ttl, fetch, value)
+                    )
+                    self.background_refreshes[key] = task
+                    task.add_done_callback(
+                        lambda _: self.background_refreshes.pop(key, None)
+                    )
+
+                return value
 
-    async def _refresh_cache(self):
-        # Pages are one-indexed with 50 users per page, and we always want to check for another user
-        next_page = self.user_count // 50 + 1
-        while next_page is not None:
-            page = await self._parse_request(
-                "GET", f"users?page={next_page}", UsersRequest
+        try:
+            value = await fetch()
+        except (CTFdError, aiohttp.ClientError, TimeoutError) as exc:
+            # while CTFd is down, anything still cached beats an error
+            cached = self.response_cache.get_stale(key)
+            if not is_transient(exc) or cached is None:
+                raise
+
+            logger.warning(
+                f"[Cache] {type(exc).__name__} while fetching {key}, serving stale data: {exc}"
             )
+            return cached[0]
 
-            pagination = page.get_pagination()
-            if pagination is None:
-                raise CTFdError("Users endpoint was not paginated.")
+        self.response_cache.set(key, value, ttl)
+        return value
 
-            for user in page.data:
-                discord_id = user.get_field(self.config.discord_id_field)
-                if discord_id is None or discord_id.value == "":
-                    continue
+    async def _refresh_entry[T](
+        self, key: str, ttl: int, fetch: Callable[[], Awaitable[T]], stale: T
+    ):
+        try:
+            self.response_cache.set(key, await fetch(), ttl)
+        except (CTFdError, aiohttp.ClientError, TimeoutError) as exc:
+            logger.warning(
+                f"[Cache] {type(exc).__name__} while refreshing {key}: {exc}"
+            )
 
-                self.discord_id_cache[int(discord_id.value)] = user.id
+            # keep serving the stale value for another stale window while CTFd is down
+            if is_transient(exc):
+                self.response_cache.set(key, stale, 0)
 
-            next_page = pagination.next
+    async def _cached_request[T](
+        self,
+        endpoint: str,
+        ty: type[Request[T]],
+        ttl: int,
+        *,
+        invalidate_cache: bool = False,
+    ) -> T:
+        async def fetch() -> T:
+            return (await self._parse_request("GET", endpoint, ty)).data
 
-    async def get_scoreboard(self) -> list[Score]:
-        return (await self._parse_request("GET", "scoreboard", ScoresRequest)).data
+        return await self._cached(
+            endpoint, ttl, fetch, invalidate_cache=invalidate_cache
+        )
+
+    async def get_scoreboard(
+        self, *, invalidate_cache: bool = False
+    ) -> Sequence[Score]:
+        return await self._cached_request(
+            "scoreboard",
+            ScoresRequest,
+            self.config.scoreboard_cache_timeout,
+            invalidate_cache=invalidate_cache,
+        )
 
-    async def get_challenges(self) -> list[Challenge]:
-        return (await self._parse_request("GET", "challenges", ChallengesRequest)).data
+    async def get_challenges(
+        self, *, invalidate_cache: bool = False
+    ) -> list[Challenge]:
+        return await self._cached_request(
+            "challenges",
+            ChallengesRequest,
+            self.config.challenges_cache_timeout,
+            invalidate_cache=invalidate_cache,
+        )
+
+    async def get_user(
+        self, user_id: int, *, invalidate_cache: bool = False
+    ) -> FullUser:
+        if not invalidate_cache:
+            user = self.user_cache.get(user_id)
+            if user is not None:
+                return user
 
-    async def get_user(self, user_id: int) -> FullUser:
-        return (
+        user = (
             await self._parse_request("GET", f"users/{user_id}", FullUserRequest)
         ).data
+        self.user_cache.set(user_id, user)
+        return user
 
     async def get_user_from_discord(self, discord_id: int) -> FullUser | None:
         user_id = self.discord_id_cache.get(discord_id)
 
         if user_id is None:
+            if discord_id in self.missing_discord_ids:
+                return None
+
             await self._refresh_cache()
 
             user_id = self.discord_id_cache.get(discord_id)
+            if user_id is None and self._full_scan_due():
+                # the user may have added their Discord ID after being scanned
+                await self._refresh_cache(full=True)
+                user_id = self.discord_id_cache.get(discord_id)
+
             if user_id is None:
+                self.missing_discord_ids.set(discord_id, True)
                 return None
 
         try:
             user = await self.get_user(user_id)
-        except CTFdError as err:
-            if err.args != ("Non-200 status code: 404 Not Found",):
-                raise err
-
+        except CTFdNotFoundError:
             user = None
+            self.user_cache.pop(user_id)
             if discord_id in self.discord_id_cache:
                 del self.discord_id_cache[discord_id]
+                self.state.remove_discord_user(discord_id)
 
         return user
 
     async def get_full_team(self, team_id: int) -> FullTeam:
-        return (
-            await self._parse_request("GET", f"teams/{team_id}", FullTeamRequest)
-        ).data
+        return await self._cached_request(
+            f"teams/{team_id}", FullTeamRequest, self.config.team_cache_timeout
+        )
+
+    async def get_team_solves(
+        self, team_id: int, *, invalidate_cache: bool = False
+    ) -> list[TeamSolve]:
+        return await self._cached_request(
+            f"teams/{team_id}/solves",
+            TeamSolvesRequest,
+            self.config.team_cache_timeout,
+            invalidate_cache=invalidate_cache,
+        )
 
-    async def get_team_solves(self, team_id: int) -> list[TeamSolve]:
-        return (
-            await self._parse_request(
-                "GET", f"teams/{team_id}/solves", TeamSolvesRequest
+    async def get_teams(self, *, invalidate_cache: bool = False) -> Sequence[Team]:
+        async def fetch() -> Sequence[Team]:
+            teams = concat(
+                [page.data async for page in self._paginate("teams", TeamsRequest)]
             )
-        ).data
 
-    async def get_teams(self, *, invalidate_cache: bool = False) -> list[Team]:
-        if (
-            datetime.datetime.now() - self.teams_cache_time
-        ).seconds < self.config.cache_timeout and not invalidate_cache:
-            return self.teams_cache
+            changed = self.team_index.update((team.id, team.name) for team in teams)
+            if changed != 0:
+                logger.debug(f"[Teams] Updated {changed} teams in the team index.")
 
-        teams: list[Team] = []
+            return teams
 
-        next_page = 1
-        while next_page is not None:
-            page = await self._parse_request("GET", "teams", TeamsRequest)
+        return await self._cached(
+            "teams", self.config.cache_timeout, fetch, invalidate_cache=invalidate_cache
+        )
 
-            pagination = page.get_pagination()
-            if pagination is None:
-                raise CTFdError("Teams endpoint was not paginated.")
+    async def get_team_id(self, name: str) -> int | None:
+        """Resolves a team name through the team index, only refetching on a miss."""
+        await self.get_teams()
+        team_id = self.team_index.resolve(name)
+        if team_id is None:
+            await self.get_teams(invalidate_cache=True)
+            team_id = self.team_index.resolve(name)
 
-            teams += page.data
-            next_page = pagination.next
+        return team_id
 
-        self.teams_cache = teams
-        self.teams_cache_time = datetime.datetime.now()
-        return teams
+    async def search_teams(self, query: str, limit: int) -> list[str]:
+        await self.get_teams()
+        return self.team_index.search(query, limit)
 
     async def register_user(
         self, name: str, email: str, password: str, discord_id: int
@@ -373,72 +975,364 @@ class CTFd_API:
         )
 
         self.discord_id_cache[discord_id] = user.data.id
+        self.missing_discord_ids.pop(discord_id)
+        self.state.add_discord_users([(discord_id, user.data.id)])
+        self.user_cache.set(user.data.id, user.data)
         return user.data
 
-    async def _webhook_task(self):
-        new_solves: set[tuple[Any, str]] = set()
-        is_init = len(self.challenge_solves) == 0
-
-        if not is_init:
-            await asyncio.sleep(self.config.webhook_frequency)
+    async def _discord_ids_for(self, user_ids: set[int]) -> dict[int, int]:
+        """Maps CTFd user IDs to Discord IDs, skipping users without one."""
+        user_discord_ids = {
+            user_id: discord_id for discord_id, user_id in self.discord_id_cache.items()
+        }
 
+        user_ids = {
+            user_id for user_id in user_ids if user_id not in self.unlinked_users
+        }
+        if not user_ids.issubset(user_discord_ids):
+            await self._refresh_cache()
+            user_discord_ids = {
+                user_id: discord_id
+                for discord_id, user_id in self.discord_id_cache.items()
+            }
+
+        async def find_discord_id(user_id: int) -> int | None:
+            async with self.webhook_semaphore:
+                try:
+                    user = await self.get_user(user_id)
+                except CTFdNotFoundError:
+                    # deleted or hidden since solving
+                    return None
+
+            discord_id = user.get_field(self.config.discord_id_field)
+            if discord_id is None or discord_id.value == "":
+                return None
+            return int(discord_id.value)
+
+        # users whose field was set after they were scanned, through the user cache
+        missing = [user_id for user_id in user_ids if user_id not in user_discord_ids]
+        for user_id, discord_id in zip(
+            missing, await asyncio.gather(*map(find_discord_id, missing))
+        ):
+            if discord_id is None:
+                self.unlinked_users.set(user_id, True)
+            else:
+                user_discord_ids[user_id] = discord_id
+
+        return {
+            user_id: user_discord_ids[user_id]
+            for user_id in user_ids
+            if user_id in user_discord_ids
+        }
+
+    async def _poll_challenge_solves(
+        self, is_init: bool, limit: int | None = None
+    ) -> WebhookPoll:
+        """Finds new solves from the solve counts of each challenge.
+
+        Each new solve costs a request to find who on the team solved it, so when
+        more than `limit` are found only the newest are looked up.
+        """
         total_solves = await self._parse_request(
             "GET", "statistics/challenges/solves", SolveStatisticsRequest
         )
 
-        for challenge in total_solves.data:
-            stored_solves = self.challenge_solves.setdefault(challenge.id, set())
-            if len(stored_solves) == challenge.solves:
-                continue
+        changed = [
+            challenge
+            for challenge in total_solves.data
+            if len(self.challenge_solves.get(challenge.id, ())) != challenge.solves
+        ]
+
+        async def fetch_solves(challenge_id: int) -> list[ChallengeSolve]:
+            async with self.webhook_semaphore:
+                solves = (
+                    await self._parse_request(
+                        "GET",
+                        f"challenges/{challenge_id}/solves",
+                        ChallengeSolvesRequest,
+                    )
+                ).data
 
-            solves = await self._parse_request(
-                "GET", f"challenges/{challenge.id}/solves", ChallengeSolvesRequest
-            )
-            for solve in solves.data:
-                if solve.account_id in stored_solves:
-                    continue
+            self._renew_poller_lease(force=False)
+            return solves
+
+        challenge_solves = await asyncio.gather(
+            *(fetch_solves(challenge.id) for challenge in changed)
+        )
 
-                stored_solves.add(solve.account_id)
-                if is_init:
+        # merged in statistics order, so the result doesn't depend on response order
+        unseen: list[tuple[SolveStatistics, ChallengeSolve]] = []
+        seen: list[tuple[int, int]] = []
+        for challenge, solves in zip(changed, challenge_solves):
+            stored_solves = self.challenge_solves.get(challenge.id, set())
+            # kept apart from stored_solves, so a failed cycle leaves nothing marked seen
+            new_accounts: set[int] = set()
+            for solve in solves:
+                if (
+                    solve.account_id in stored_solves
+                    or solve.account_id in new_accounts
+                ):
                     continue
 
-                team_solves = await self.get_team_solves(solve.account_id)
-                solve = next(
-                    filter(
-                        lambda solve: solve.challenge_id == challenge.id, team_solves
-                    )
+                new_accounts.add(solve.account_id)
+                seen.append((challenge.id, solve.account_id))
+                if not is_init:
+                    unseen.append((challenge, solve))
+
+        if limit is not None and len(unseen) > limit:
+            skipped = len(unseen) - limit
+            logger.warning(
+                f"[Webhook Task] Skipping the {skipped} oldest solves missed while offline."
+            )
+            unseen.sort(key=lambda unseen_solve: unseen_solve[1].date)
+            unseen = unseen[skipped:]
+
+        async def find_solver(
+            challenge: SolveStatistics, solve: ChallengeSolve
+        ) -> tuple[str, int, str] | None:
+            async with self.webhook_semaphore:
+                team_solves = await self.get_team_solves(
+                    solve.account_id, invalidate_cache=True
                 )
+            self._renew_poller_lease(force=False)
 
-                user = await self.get_user(solve.user.id)
-                discord_id = user.get_field(self.config.discord_id_field)
-                if discord_id is None or discord_id.value == "":
-                    continue
+            team_solve = next(
+                filter(lambda solve: solve.challenge_id == challenge.id, team_solves),
+                None,
+            )
+            if team_solve is None:
+                return None
 
-                new_solves.add((discord_id.value, challenge.name))
-
-        if len(new_solves) != 0:
-            async with ClientSession(
-                timeout=ClientTimeout(total=self.config.api_timeout)
-            ) as session:
-                await session.post(
-                    self.config.webhook_url,
-                    json={
-                        "content": "\n".join(
-                            [
-                                f"<@{solve[0]}> just solved {solve[1]}!"
-                                for solve in new_solves
-                            ]
-                        )
-                    },
+            return (solve.date, team_solve.user.id, challenge.name)
+
+        # (date, user_id, challenge_name), sorted by date so solves are announced in order
+        new_solves = sorted(
+            solve
+            for solve in await asyncio.gather(
+                *(find_solver(challenge, solve) for challenge, solve in unseen)
+            )
+            if solve is not None
+        )
+        return WebhookPoll(
+            [(user_id, challenge_name) for _, user_id, challenge_name in new_solves],
+            seen=seen,
+        )
+
+    async def _poll_submissions(self) -> WebhookPoll:
+        """Finds new solves from the correct submissions feed.
+
+        Submissions are listed oldest first, so only the pages from the one holding
+        the last seen submission onwards need to be fetched.
+        """
+        endpoint = f"submissions?type=correct&per_page={SUBMISSIONS_PER_PAGE}"
+
+        watermark = self.submissions_watermark
+        if watermark is None:
+            # Nothing to announce on the first poll, just find the newest submission
+            first = await self._parse_request(
+                "GET", paged_endpoint(endpoint, 1), SubmissionsRequest
+            )
+            pagination = first.get_pagination()
+            if pagination is None:
+                raise CTFdError("Submissions endpoint was not paginated.")
+
+            last = first
+            if pagination.pages > 1:
+                last = await self._parse_request(
+                    "GET",
+                    paged_endpoint(endpoint, pagination.pages),
+                    SubmissionsRequest,
                 )
 
+            return WebhookPoll(
+                [],
+                submissions_watermark={
+                    "id": max((sub.id for sub in last.data), default=0),
+                    "total": pagination.total,
+                },
+            )
+
+        new_submissions: list[Submission] = []
+        total = watermark["total"]
+        start_page = max(watermark["total"] - 1, 0) // SUBMISSIONS_PER_PAGE + 1
+
+        async for page in self._paginate(
+            endpoint, SubmissionsRequest, start_page=start_page
+        ):
+            new_submissions += (sub for sub in page.data if sub.id > watermark["id"])
+            self._renew_poller_lease(force=False)
+
+            pagination = page.get_pagination()
+            if pagination is not None:
+                total = pagination.total
+
+        new_submissions.sort(key=lambda sub: sub.id)
+
+        return WebhookPoll(
+            [(sub.user.id, sub.challenge.name) for sub in new_submissions],
+            submissions_watermark={
+                "id": max((sub.id for sub in new_submissions), default=watermark["id"]),
+                "total": total,
+            },
+        )
+
+    def _load_webhook_state(self):
+        self.challenge_solves = self.state.load_challenge_solves()
+        self.unflushed_solves = []
+        self.submissions_watermark = self.state.get_meta("submissions_watermark")
+        if self.config.webhook_mode == WebhookMode.SUBMISSIONS:
+            self.catching_up = self.submissions_watermark is not None
+        else:
+            self.catching_up = len(self.challenge_solves) != 0
+
+    def _poller_lease_ttl(self) -> float:
+        """Returns how long the poller lease lasts once taken or renewed.
+
+        It outlives the longest interval between polls by POLLER_LEASE_TIMEOUT, after
+        which a process on standby takes over.
+        """
+        return self.webhook_schedule.max_interval + self.config.poller_lease_timeout
+
+    def _acquire_poller_lease(self) -> bool:
+        """Makes sure only one process sharing the state store polls for new solves."""
+        held = self.state.acquire_lease(
+            POLLER_LEASE, self.lease_owner, self._poller_lease_ttl()
+        )
+        self.lease_renewed = time.monotonic()
+
+        if held and not self.holds_poller_lease:
+            # another process may have announced solves since this one last polled
+            self._load_webhook_state()
+            logger.info("[Webhook Task] Polling for new solves from this process.")
+        elif not held and self.holds_poller_lease is not False:
+            logger.info(
+                "[Webhook Task] Another process is polling for new solves, standing by."
+            )
+
+        self.holds_poller_lease = held
+        return held
+
+    def _renew_poller_lease(self, *, force: bool = True) -> bool:
+        """Extends the poller lease through a cycle slowed by retries and backoff.
+
+        Unless `force` is set, the lease is only written once a quarter of its TTL
+        has passed since it was last renewed. Returns whether this process still
+        holds it.
+        """
+        if (
+            not force
+            and time.monotonic() - self.lease_renewed < self._poller_lease_ttl() / 4
+        ):
+            return self.holds_poller_lease is True
+
+        held = self.state.acquire_lease(
+            POLLER_LEASE, self.lease_owner, self._poller_lease_ttl()
+        )
+        self.lease_renewed = time.monotonic()
+
+        if not held and self.holds_poller_lease:
+            logger.warning(
+                "[Webhook Task] Another process took over polling for new solves"
+                " during this cycle."
+            )
+
+        # the next _acquire_poller_lease reloads the state if this process takes it back
+        self.holds_poller_lease = held
+        return held
+
+    async def _webhook_task(self):
+        # the first poll is due immediately, unless a failed one pushed it back
+        await asyncio.sleep(self.webhook_schedule.delay())
+
+        if not self._acquire_poller_lease():
+            self.webhook_schedule.standby()
+            return
+
+        if self.config.webhook_mode == WebhookMode.SUBMISSIONS:
+            is_init = self.submissions_watermark is None
+        else:
+            is_init = len(self.challenge_solves) == 0
+
+        start = time.monotonic()
+        if self.config.webhook_mode == WebhookMode.SUBMISSIONS:
+            poll = await self._poll_submissions()
+        else:
+            poll = await self._poll_challenge_solves(
+                is_init,
+                self.config.webhook_catchup_limit if self.catching_up else None,
+            )
+
+        new_solves = poll.solves
+
+        # the statistics poll has already dropped the oldest before looking them up
+        if self.catching_up and len(new_solves) > self.config.webhook_catchup_limit:
+            skipped = len(new_solves) - self.config.webhook_catchup_limit
+            logger.warning(
+                f"[Webhook Task] Skipping the {skipped} oldest solves missed while offline."
+            )
+            new_solves = new_solves[skipped:]
+
+        discord_ids = await self._discord_ids_for({solve[0] for solve in new_solves})
+        # dict.fromkeys removes duplicates while keeping the solve order
+        announcements = dict.fromkeys(
+            (discord_ids[user_id], challenge_name)
+            for user_id, challenge_name in new_solves
+            if user_id in discord_ids
+        )
+
+        # the poll is applied right after, with no await between, so this also
+        # covers saving the seen solves and the submissions watermark
+        if not self._renew_poller_lease():
+            self.webhook_schedule.standby()
+            return
+
+        if self.webhook_sender is not None:
+            self.webhook_sender.send(
+                f"<@{solve[0]}> just solved {solve[1]}!" for solve in announcements
+            )
+
+        # only now that the solves are queued for announcement are they marked seen
+        self._apply_webhook_poll(poll)
+        self.catching_up = False
+
+        elapsed = time.monotonic() - start
+        WEBHOOK_CYCLE_SECONDS.observe(elapsed, mode=self.config.webhook_mode)
+        interval = self.webhook_schedule.interval
+        self.webhook_schedule.record_cycle(start, elapsed, len(new_solves))
+        logger.log(
+            "WARNING" if elapsed > interval else "DEBUG",
+            f"[Webhook Task] Cycle took {elapsed:.2f}s, found {len(new_solves)} new solves,"
+            f" next in {self.webhook_schedule.interval:.1f}s.",
+        )
+
+    def _apply_webhook_poll(self, poll: WebhookPoll):
+        for challenge_id, account_id in poll.seen:
+            self.challenge_solves.setdefault(challenge_id, set()).add(account_id)
+        self.unflushed_solves += poll.seen
+        if poll.submissions_watermark is not None:
+            self.submissions_watermark = poll.submissions_watermark
+
+        self._flush_webhook_state()
+
+    def _flush_webhook_state(self):
+        if len(self.unflushed_solves) != 0:
+            self.state.add_challenge_solves(self.unflushed_solves)
+            self.unflushed_solves = []
+
+        if self.submissions_watermark is not None:
+            self.state.set_meta("submissions_watermark", self.submissions_watermark)
+
     def _webhook_manager(self, task: asyncio.Task[None] | None = None):
+        if task is not None and task.cancelled():
+            return
+
         if task is not None and (exc := task.exception()) is not None:
             warn = isinstance(exc, asyncio.TimeoutError)
             logger.log(
                 "WARNING" if warn else "ERROR",
                 f"[Webhook Task] {type(exc).__name__}: {exc}",
             )
+            self.webhook_schedule.record_error()
 
-        task = asyncio.create_task(self._webhook_task())
-        task.add_done_callback(self._webhook_manager)
+        self.webhook_task = asyncio.create_task(self._webhook_task())
+        self.webhook_task.add_done_callback(self._webhook_manager)
@@ -0,0 +1,302 @@
+import dataclasses
+import types
+import typing
+from collections.abc import Callable, Sequence
+from typing import Any, Literal, Union
+
+import typedload
+
+from ctfd_discord_bot.utils.errors import DecodeError
+from ctfd_discord_bot.utils.lazy import LazyList
+
+type Loader = Callable[[Any], Any]
+
+BASIC_TYPES = (int, float, str, bool)
+
+
+def identity(value: Any) -> Any:
+    return value
+
+
+class Decoder:
+    """Decodes JSON values into the CTFd models.
+
+    A specialised loader is built once per type and reused, rather than walking
+    the type on every call like `typedload.load`. It mirrors typedload's
+    behaviour: extra keys are ignored and basic types are cast where possible.
+
+    In trusted mode values are assumed to already have the right shape, so only
+    nested models are constructed and every other check is skipped.
+
+    Fields annotated as `Sequence[T]` are decoded lazily into a `LazyList`, so
+    each item is only decoded (and validated) the first time it is accessed.
+    With `lazy=False` they are decoded eagerly into a list instead.
+    """
+
+    trusted: bool
+    lazy: bool
+    loaders: dict[Any, Loader]
+
+    def __init__(self, *, trusted: bool = False, lazy: bool = True):
+        self.trusted = trusted
+        self.lazy = lazy
+        self.loaders = {}
+
+    def load[T](self, value: Any, ty: type[T]) -> T:
+        return self.loader(ty)(value)
+
+    def loader(self, ty: Any) -> Loader:
+        loader = self.loaders.get(ty)
+        if loader is not None:
+            return loader
+
+        try:
+            loader = self._build(ty)
+        except TypeError:
+            # not something we know how to specialise, let typedload handle it
+            def load_fallback(value: Any) -> Any:
+                return typedload.load(value, ty)
+
+            loader = load_fallback
+
+        self.loaders[ty] = loader
+        return loader
+
+    def _build(self, ty: Any) -> Loader:
+        if ty is Any:
+            return identity
+
+        if ty is None or ty is types.NoneType:
+            return identity if self.trusted else load_none
+
+        if ty in BASIC_TYPES:
+            return identity if self.trusted else basic_loader(ty)
+
+        if dataclasses.is_dataclass(ty):
+            return self._build_dataclass(ty)  # pyright: ignore[reportArgumentType]
+
+        origin = typing.get_origin(ty)
+        args = typing.get_args(ty)
+
+        if origin is Literal:
+            return identity if self.trusted else literal_loader(ty, set(args))
+
+        if origin is Union or origin is types.UnionType:
+            return self._build_union(ty, args)
+
+        if origin is list:
+            return self._build_list(args[0])
+
+        if origin is Sequence:
+            if self.lazy:
+                return self._build_sequence(args[0])
+
+            return self._build_list(args[0])
+
+        if origin is dict:
+            return self._build_dict(args[0], args[1])
+
+        raise TypeError(f"Cannot build a loader for {ty}")
+
+    def _build_dataclass(self, ty: type[Any]) -> Loader:
+        hints: dict[str, Any] | None = None
+        # (name, loader, required, types that need no conversion)
+        fields: list[tuple[str, Loader, bool, frozenset[type[Any]]]] = []
+
+        for field in dataclasses.fields(ty):
+            if not field.init:
+                continue
+
+            field_ty = field.type
+            if isinstance(field_ty, str):
+                hints = hints or typing.get_type_hints(ty)
+                field_ty = hints[field.name]
+
+            required = (
+                field.default is dataclasses.MISSING
+                and field.default_factory is dataclasses.MISSING
+            )
+            fields.append(
+                (field.name, self.loader(field_ty), required, exact_types(field_ty))
+            )
+
+        if self.trusted:
+            # fields that need no conversion are copied straight across
+            plain = [name for name, loader, _, _ in fields if loader is identity]
+            nested = [
+                (name, loader)
+                for name, loader, _, _ in fields
+                if loader is not identity
+            ]
+
+            def load_trusted(value: Any) -> Any:
+                kwargs = {name: value[name] for name in plain if name in value}
+                for name, loader in nested:
+                    if name in value:
+                        kwargs[name] = loader(value[name])
+
+                return ty(**kwargs)
+
+            return load_trusted
+
+        def load_dataclass(value: Any) -> Any:
+            if not isinstance(value, dict):
+                raise DecodeError(
+                    f"Expected an object for {ty.__name__}, got {type(value).__name__}"
+                )
+
+            kwargs: dict[str, Any] = {}
+            for name, loader, required, exact in fields:
+                if name in value:
+                    item = value[name]
+                    # checked inline, since most fields are already the right type
+                    if type(item) in exact:
+                        kwargs[name] = item
+                        continue
+
+                    try:
+                        kwargs[name] = loader(item)
+                    except DecodeError as err:
+                        raise DecodeError(f"{ty.__name__}.{name}: {err}") from None
+                elif required:
+                    raise DecodeError(f"{ty.__name__} is missing field {name}")
+
+            return ty(**kwargs)
+
+        return load_dataclass
+
+    def _build_union(self, ty: Any, args: tuple[Any, ...]) -> Loader:
+        loaders = [self.loader(arg) for arg in args]
+        if self.trusted and all(loader is identity for loader in loaders):
+            return identity
+
+        exact = tuple(
+            types.NoneType if arg is None else arg
+            for arg in args
+            if arg is None or arg in BASIC_TYPES
+        )
+
+        def load_union(value: Any) -> Any:
+            # prefer a member that matches exactly before trying to cast
+            if isinstance(value, exact):
+                return value
+
+            for loader in loaders:
+                try:
+                    return loader(value)
+                except DecodeError:
+                    continue
+
+            raise DecodeError(f"Expected {ty}, got {value!r}")
+
+        return load_union
+
+    def _build_list(self, item_ty: Any) -> Loader:
+        item_loader = self.loader(item_ty)
+
+        if self.trusted:
+            if item_loader is identity:
+                return identity
+
+            def load_trusted(value: Any) -> Any:
+                return [item_loader(item) for item in value]
+
+            return load_trusted
+
+        def load_list(value: Any) -> Any:
+            if not isinstance(value, list):
+                raise DecodeError(f"Expected a list, got {type(value).__name__}")
+
+            return [item_loader(item) for item in value]  # pyright: ignore[reportUnknownVariableType]
+
+        return load_list
+
+    def _build_sequence(self, item_ty: Any) -> Loader:
+        item_loader = self.loader(item_ty)
+
+        if item_loader is identity:
+            # nothing to defer, the raw list is already a sequence of the right items
+            return self._build_list(item_ty)
+
+        if self.trusted:
+
+            def load_trusted(value: Any) -> Any:
+                return LazyList(value, item_loader)
+
+            return load_trusted
+
+        def load_sequence(value: Any) -> Any:
+            if not isinstance(value, list):
+                raise DecodeError(f"Expected a list, got {type(value).__name__}")
+
+            return LazyList(value, item_loader)  # pyright: ignore[reportUnknownArgumentType]
+
+        return load_sequence
+
+    def _build_dict(self, key_ty: Any, value_ty: Any) -> Loader:
+        key_loader = self.loader(key_ty)
+        value_loader = self.loader(value_ty)
+
+        if self.trusted and key_loader is identity and value_loader is identity:
+            return identity
+
+        def load_dict(value: Any) -> Any:
+            if not isinstance(value, dict):
+                raise DecodeError(f"Expected an object, got {type(value).__name__}")
+
+            return {key_loader(k): value_loader(v) for k, v in value.items()}  # pyright: ignore[reportUnknownVariableType]
+
+        return load_dict
+
+
+def exact_types(ty: Any) -> frozenset[type[Any]]:
+    """Returns the types a value of `ty` can be used as is, without a loader."""
+    if ty is None or ty is types.NoneType:
+        return frozenset((types.NoneType,))
+
+    if ty in BASIC_TYPES:
+        return frozenset((ty,))
+
+    origin = typing.get_origin(ty)
+    if origin is Union or origin is types.UnionType:
+        return frozenset().union(*map(exact_types, typing.get_args(ty)))
+
+    return frozenset()
+
+
+def load_none(value: Any) -> None:
+    if value is not None:
+        raise DecodeError(f"Expected null, got {value!r}")
+
+
+def basic_loader(ty: type[Any]) -> Loader:
+    def load_basic(value: Any) -> Any:
+        if type(value) is ty:
+            return value
+
+        if value is None or not isinstance(value, BASIC_TYPES):
+            raise DecodeError(f"Expected {ty.__name__}, got {value!r}")
+
+        try:
+            return ty(value)
+        except ValueError:
+            raise DecodeError(f"Expected {ty.__name__}, got {value!r}") from None
+
+    return load_basic
+
+
+def literal_loader(ty: Any, allowed: set[Any]) -> Loader:
+    def load_literal(value: Any) -> Any:
+        if value not in allowed:
+            raise DecodeError(f"Expected {ty}, got {value!r}")
+
+        return value
+
+    return load_literal
+
+
+DECODERS = {False: Decoder(), True: Decoder(trusted=True)}
+
+
+def get_decoder(*, trusted: bool = False) -> Decoder:
+    return DECODERS[trusted]
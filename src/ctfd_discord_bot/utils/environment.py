@@ -1,7 +1,8 @@
 import os
+from collections.abc import Callable
 from dataclasses import MISSING, dataclass, field
 from enum import StrEnum
-from typing import Any, Self
+from typing import Any
 from urllib.parse import urlparse, urlunparse
 
 from ctfd_discord_bot.utils.errors import ConfigError
@@ -21,12 +22,48 @@ class BotMode(StrEnum):
     DEVELOPMENT = "dev"
     PRODUCTION = "prod"
 
-    @classmethod
-    def parse(cls: type[Self], value: str) -> Self:
+
+class WebhookMode(StrEnum):
+    # poll solve counts, then fetch the solves of every changed challenge
+    STATISTICS = "statistics"
+    # poll the correct submissions feed past the last seen submission
+    SUBMISSIONS = "submissions"
+
+
+class PollerMode(StrEnum):
+    # poll for solves from the bot process
+    EMBEDDED = "embedded"
+    # leave polling to the ctfd-discord-poller process
+    EXTERNAL = "external"
+
+
+class ShardMode(StrEnum):
+    # a single unsharded gateway connection
+    OFF = "off"
+    # let Discord choose the shard count, running every shard in this process
+    AUTO = "auto"
+    # run only SHARD_IDS out of SHARD_COUNT shards in this process
+    FIXED = "fixed"
+
+
+def parse_enum[E: StrEnum](enum: type[E]) -> Callable[[str], E]:
+    def parser(value: str) -> E:
         try:
-            return cls(value.lower())
+            return enum(value.lower())
         except ValueError:
-            raise ConfigError("Expected bot mode, got " + value)
+            raise ConfigError(f"Expected one of {', '.join(enum)}, got {value}")
+
+    return parser
+
+
+def parse_bool(value: str) -> bool:
+    if value.lower() in ("1", "true", "yes", "on"):
+        return True
+
+    if value.lower() in ("0", "false", "no", "off"):
+        return False
+
+    raise ConfigError("Expected boolean, got " + value)
 
 
 def parse_positive_int(value: str) -> int:
@@ -41,6 +78,12 @@ def parse_positive_int(value: str) -> int:
     return num
 
 
+def parse_int_list(value: str) -> tuple[int, ...]:
+    return tuple(
+        parse_positive_int(item.strip()) for item in value.split(",") if item.strip()
+    )
+
+
 @dataclass(frozen=True)
 class Config:
     ctfd_instance_url: str = field(metadata={"parser": normalize_url})
@@ -51,13 +94,89 @@ class Config:
     bot_token: str
     feedback_url: str
     webhook_frequency: int = field(default=10, metadata={"parser": parse_positive_int})
+    webhook_min_frequency: int = field(
+        default=2, metadata={"parser": parse_positive_int}
+    )
+    webhook_max_frequency: int = field(
+        default=60, metadata={"parser": parse_positive_int}
+    )
+    webhook_mode: WebhookMode = field(
+        default=WebhookMode.STATISTICS, metadata={"parser": parse_enum(WebhookMode)}
+    )
+    poller_mode: PollerMode = field(
+        default=PollerMode.EMBEDDED, metadata={"parser": parse_enum(PollerMode)}
+    )
+    poller_lease_timeout: int = field(
+        default=60, metadata={"parser": parse_positive_int}
+    )
+    webhook_catchup_limit: int = field(
+        default=50, metadata={"parser": parse_positive_int}
+    )
+    webhook_concurrency: int = field(default=8, metadata={"parser": parse_positive_int})
     api_timeout: int = field(default=5, metadata={"parser": parse_positive_int})
+    api_connect_timeout: int = field(default=3, metadata={"parser": parse_positive_int})
+    api_read_timeout: int = field(default=0, metadata={"parser": parse_positive_int})
+    api_pool_size: int = field(default=100, metadata={"parser": parse_positive_int})
+    api_pool_per_host: int = field(default=0, metadata={"parser": parse_positive_int})
+    api_keepalive_timeout: int = field(
+        default=15, metadata={"parser": parse_positive_int}
+    )
+    api_dns_cache_ttl: int = field(default=10, metadata={"parser": parse_positive_int})
+    api_concurrency: int = field(default=8, metadata={"parser": parse_positive_int})
+    api_max_retries: int = field(default=3, metadata={"parser": parse_positive_int})
+    api_retry_backoff: int = field(default=1, metadata={"parser": parse_positive_int})
+    api_max_backoff: int = field(default=30, metadata={"parser": parse_positive_int})
+    circuit_failure_threshold: int = field(
+        default=5, metadata={"parser": parse_positive_int}
+    )
+    circuit_reset_timeout: int = field(
+        default=30, metadata={"parser": parse_positive_int}
+    )
+    trusted_decoding: bool = field(default=False, metadata={"parser": parse_bool})
     cache_timeout: int = field(default=60, metadata={"parser": parse_positive_int})
+    cache_stale_timeout: int = field(
+        default=60, metadata={"parser": parse_positive_int}
+    )
+    cache_size: int = field(default=1024, metadata={"parser": parse_positive_int})
+    scoreboard_cache_timeout: int = field(
+        default=10, metadata={"parser": parse_positive_int}
+    )
+    scoreboard_refresh_interval: int = field(
+        default=10, metadata={"parser": parse_positive_int}
+    )
+    challenges_cache_timeout: int = field(
+        default=30, metadata={"parser": parse_positive_int}
+    )
+    catalog_refresh_interval: int = field(
+        default=30, metadata={"parser": parse_positive_int}
+    )
+    team_cache_timeout: int = field(default=10, metadata={"parser": parse_positive_int})
+    user_cache_timeout: int = field(default=30, metadata={"parser": parse_positive_int})
+    user_cache_size: int = field(default=4096, metadata={"parser": parse_positive_int})
+    render_cache_size: int = field(default=256, metadata={"parser": parse_positive_int})
     register_timeout: int = field(default=60, metadata={"parser": parse_positive_int})
+    negative_cache_timeout: int = field(
+        default=30, metadata={"parser": parse_positive_int}
+    )
+    negative_cache_size: int = field(
+        default=10000, metadata={"parser": parse_positive_int}
+    )
+    users_rescan_interval: int = field(
+        default=600, metadata={"parser": parse_positive_int}
+    )
     bot_mode: BotMode = field(
-        default=BotMode.DEVELOPMENT, metadata={"parser": BotMode.parse}
+        default=BotMode.DEVELOPMENT, metadata={"parser": parse_enum(BotMode)}
     )
     push_url: str | None = field(default=None, metadata={"parser": normalize_url})
+    state_path: str = field(default="./data/state.sqlite3")
+    shard_mode: ShardMode = field(
+        default=ShardMode.OFF, metadata={"parser": parse_enum(ShardMode)}
+    )
+    shard_count: int = field(default=0, metadata={"parser": parse_positive_int})
+    shard_ids: tuple[int, ...] = field(default=(), metadata={"parser": parse_int_list})
+    metrics_host: str = field(default="127.0.0.1")
+    metrics_port: int = field(default=0, metadata={"parser": parse_positive_int})
+    poller_metrics_port: int = field(default=0, metadata={"parser": parse_positive_int})
 
     def __init__(self):
         for cur_field in self.__dataclass_fields__.values():
@@ -76,3 +195,11 @@ class Config:
                     parser = cur_field.metadata["parser"]
 
                 object.__setattr__(self, cur_field.name, parser(value.strip()))
+
+        # the default ceiling makes room for a longer usual frequency, rather than clamping it
+        if os.getenv("WEBHOOK_MAX_FREQUENCY") is None:
+            object.__setattr__(
+                self,
+                "webhook_max_frequency",
+                max(self.webhook_max_frequency, self.webhook_frequency),
+            )
@@ -8,3 +8,33 @@ class CTFdError(Exception):
     """Raised when the CTFd API returns an error."""
 
     pass
+
+
+class DecodeError(CTFdError):
+    """Raised when a CTFd response does not match the expected model."""
+
+    pass
+
+
+class CTFdHTTPError(CTFdError):
+    """Raised when the CTFd API responds with a non-200 status code."""
+
+    status: int
+    reason: str | None
+
+    def __init__(self, status: int, reason: str | None):
+        super().__init__(f"Non-200 status code: {status} {reason}")
+        self.status = status
+        self.reason = reason
+
+
+class CTFdNotFoundError(CTFdHTTPError):
+    """Raised when the requested CTFd resource does not exist."""
+
+    pass
+
+
+class CTFdUnavailableError(CTFdError):
+    """Raised without contacting CTFd while the circuit breaker is open."""
+
+    pass
@@ -0,0 +1,77 @@
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from typing import Any, overload
+
+MISSING: Any = object()
+
+
+class LazyList[T](Sequence[T]):
+    """A read-only list of models that are decoded from their raw JSON rows on access.
+
+    Each row is decoded at most once, so callers that only look at a few items of
+    a large response skip decoding the rest.
+    """
+
+    __slots__ = ("rows", "loader", "items")
+
+    rows: list[Any]
+    loader: Callable[[Any], T]
+    items: list[T]
+
+    def __init__(self, rows: list[Any], loader: Callable[[Any], T]):
+        self.rows = rows
+        self.loader = loader
+        self.items = [MISSING] * len(rows)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    @overload
+    def __getitem__(self, index: int) -> T: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[T]: ...
+
+    def __getitem__(self, index: int | slice) -> T | list[T]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self.rows)))]
+
+        item = self.items[index]
+        if item is MISSING:
+            item = self.items[index] = self.loader(self.rows[index])
+
+        return item
+
+    def __iter__(self) -> Iterator[T]:
+        for i in range(len(self.rows)):
+            yield self[i]
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Sequence):
+            return NotImplemented
+
+        return len(self) == len(other) and all(  # pyright: ignore[reportUnknownArgumentType]
+            a == b
+            for a, b in zip(self, other)  # pyright: ignore[reportUnknownArgumentType]
+        )
+
+    def __repr__(self) -> str:
+        decoded = sum(1 for item in self.items if item is not MISSING)
+        return f"<LazyList of {len(self.rows)} rows, {decoded} decoded>"
+
+
+def concat[T](sequences: Iterable[Sequence[T]]) -> Sequence[T]:
+    """Joins sequences, without decoding them if they are all lazy."""
+    sequences = list(sequences)
+    if not all(isinstance(sequence, LazyList) for sequence in sequences):
+        return [item for sequence in sequences for item in sequence]
+
+    lazy_lists: list[LazyList[T]] = sequences  # pyright: ignore[reportAssignmentType]
+    if len(lazy_lists) == 0:
+        return []
+
+    # every page of an endpoint is decoded by the same loader
+    joined = LazyList(
+        [row for lazy in lazy_lists for row in lazy.rows], lazy_lists[0].loader
+    )
+    joined.items = [item for lazy in lazy_lists for item in lazy.items]
+    return joined
@@ -0,0 +1,35 @@
+import os
+import sys
+from datetime import datetime
+
+from loguru import logger
+
+from ctfd_discord_bot.utils.environment import BotMode, Config
+
+
+def setup_logging(config: Config, *, prefix: str = ""):
+    """Logs to the console and to a new file in ./logs, shared by every entry point."""
+    log_dir = "./logs"
+    if not os.path.exists(log_dir):
+        os.makedirs(log_dir)
+
+    log_filename = prefix + datetime.now().strftime("%Y-%m-%d-%H-%M-%S.log")
+    level = "DEBUG" if config.bot_mode == BotMode.DEVELOPMENT else "INFO"
+
+    logger.remove()  # remove default handler
+
+    logger.add(sys.stderr, level="ERROR")
+    logger.add(
+        sys.stdout,
+        level=level,
+        # avoid duplication of errors in console, since stderr often is piped to stdout
+        filter=lambda record: record["level"].no <= logger.level("WARNING").no,
+    )
+
+    logger.add(
+        os.path.join(log_dir, log_filename),
+        level=level,
+        format="{time:YYYY-MM-DD HH:mm:ss.SSS} | {level: <8} | {name}:{function}:{line} - {message}",
+        rotation="2 MB",
+        diagnose=config.bot_mode == BotMode.DEVELOPMENT,
+    )
@@ -0,0 +1,272 @@
+import abc
+import bisect
+import math
+import time
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
+
+import discord
+from aiohttp import web
+from loguru import logger
+
+type LabelValues = tuple[str, ...]
+type Sample = tuple[str, dict[str, str], float]
+
+# Upper bounds of the latency histograms in seconds, Discord allows 3s to respond
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+
+def escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def format_labels(labels: dict[str, str]) -> str:
+    if len(labels) == 0:
+        return ""
+
+    pairs = (f'{name}="{escape_label(value)}"' for name, value in labels.items())
+    return "{" + ",".join(pairs) + "}"
+
+
+def format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+
+    return repr(float(value))
+
+
+class Metric(abc.ABC):
+    """A named family of samples, exposed in the Prometheus text format."""
+
+    name: str
+    documentation: str
+    type: str
+    labelnames: tuple[str, ...]
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    def _key(self, labels: dict[str, str]) -> LabelValues:
+        if labels.keys() != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}")
+
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _labels(self, key: LabelValues) -> dict[str, str]:
+        return dict(zip(self.labelnames, key))
+
+    @abc.abstractmethod
+    def samples(self) -> Iterator[Sample]: ...
+
+    def render(self) -> str:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type}",
+        ]
+        for name, labels, value in self.samples():
+            lines.append(f"{name}{format_labels(labels)} {format_value(value)}")
+
+        return "\n".join(lines)
+
+
+class Counter(Metric):
+    type = "counter"
+    values: dict[LabelValues, float]
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self.values = {}
+
+    def inc(self, amount: float = 1, /, **labels: str):
+        key = self._key(labels)
+        self.values[key] = self.values.get(key, 0) + amount
+
+    def samples(self) -> Iterator[Sample]:
+        for key, value in self.values.items():
+            yield (f"{self.name}_total", self._labels(key), value)
+
+
+class Gauge(Metric):
+    type = "gauge"
+    values: dict[LabelValues, float]
+    functions: dict[LabelValues, Callable[[], float]]
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self.values = {}
+        self.functions = {}
+
+    def set(self, value: float, /, **labels: str):
+        self.values[self._key(labels)] = value
+
+    def inc(self, amount: float = 1, /, **labels: str):
+        key = self._key(labels)
+        self.values[key] = self.values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, /, **labels: str):
+        self.inc(-amount, **labels)
+
+    @contextmanager
+    def track(self, **labels: str) -> Iterator[None]:
+        """Counts the block as in progress while it runs."""
+        self.inc(**labels)
+        try:
+            yield
+        finally:
+            self.dec(**labels)
+
+    def set_function(self, function: Callable[[], float], /, **labels: str):
+        """Reads the value from `function` whenever the metrics are collected."""
+        self.functions[self._key(labels)] = function
+
+    def samples(self) -> Iterator[Sample]:
+        for key, value in self.values.items():
+            yield (self.name, self._labels(key), value)
+
+        for key, function in self.functions.items():
+            yield (self.name, self._labels(key), function())
+
+
+class Histogram(Metric):
+    type = "histogram"
+    buckets: tuple[float, ...]
+    # label values -> (count per bucket, sum, count)
+    values: dict[LabelValues, tuple[list[int], float, int]]
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        *,
+        buckets: Iterable[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = (*sorted(buckets), math.inf)
+        self.values = {}
+
+    def observe(self, value: float, /, **labels: str):
+        key = self._key(labels)
+        counts, total, count = self.values.get(key) or ([0] * len(self.buckets), 0, 0)
+        counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.values[key] = (counts, total + value, count + 1)
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def samples(self) -> Iterator[Sample]:
+        for key, (counts, total, count) in self.values.items():
+            labels = self._labels(key)
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                yield (
+                    f"{self.name}_bucket",
+                    {**labels, "le": format_value(bound)},
+                    cumulative,
+                )
+
+            yield (f"{self.name}_sum", labels, total)
+            yield (f"{self.name}_count", labels, count)
+
+
+class Registry:
+    metrics: dict[str, Metric]
+
+    def __init__(self):
+        self.metrics = {}
+
+    def register[M: Metric](self, metric: M) -> M:
+        # re-registering replaces the old metric, so reloading a module is harmless
+        self.metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        return "\n".join(metric.render() for metric in self.metrics.values()) + "\n"
+
+
+REGISTRY = Registry()
+
+
+def counter(name: str, documentation: str, labelnames: Iterable[str] = ()) -> Counter:
+    return REGISTRY.register(Counter(name, documentation, labelnames))
+
+
+def gauge(name: str, documentation: str, labelnames: Iterable[str] = ()) -> Gauge:
+    return REGISTRY.register(Gauge(name, documentation, labelnames))
+
+
+def histogram(
+    name: str,
+    documentation: str,
+    labelnames: Iterable[str] = (),
+    *,
+    buckets: Iterable[float] = DEFAULT_BUCKETS,
+) -> Histogram:
+    return REGISTRY.register(
+        Histogram(name, documentation, labelnames, buckets=buckets)
+    )
+
+
+COMMAND_DEFER_SECONDS = histogram(
+    "discord_command_defer_seconds",
+    "Time from an interaction being created to it being deferred.",
+    ["command"],
+)
+COMMAND_DURATION_SECONDS = histogram(
+    "discord_command_duration_seconds",
+    "Time from an interaction being created to its command finishing.",
+    ["command", "outcome"],
+)
+
+
+def interaction_age(interaction: discord.Interaction) -> float:
+    return (discord.utils.utcnow() - interaction.created_at).total_seconds()
+
+
+def command_name(interaction: discord.Interaction) -> str:
+    command = interaction.command
+    return "unknown" if command is None else command.qualified_name
+
+
+async def defer(interaction: discord.Interaction, **kwargs: bool):
+    """Defers the interaction, recording how long it took to acknowledge."""
+    await interaction.response.defer(**kwargs)
+    COMMAND_DEFER_SECONDS.observe(
+        interaction_age(interaction), command=command_name(interaction)
+    )
+
+
+def observe_command(interaction: discord.Interaction, outcome: str):
+    COMMAND_DURATION_SECONDS.observe(
+        interaction_age(interaction),
+        command=command_name(interaction),
+        outcome=outcome,
+    )
+
+
+async def start_metrics_server(host: str, port: int) -> web.AppRunner:
+    """Serves every registered metric at /metrics in the Prometheus text format."""
+
+    async def handle_metrics(_request: web.Request) -> web.Response:
+        return web.Response(
+            body=REGISTRY.render().encode(),
+            headers={"Content-Type": "text/plain; version=0.0.4; charset=utf-8"},
+        )
+
+    app = web.Application()
+    app.router.add_get("/metrics", handle_metrics)
+
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+
+    logger.info(f"Serving metrics on http://{host}:{port}/metrics")
+    return runner
@@ -0,0 +1,49 @@
+import abc
+import asyncio
+
+import aiohttp
+from loguru import logger
+
+from ctfd_discord_bot.utils.errors import CTFdError
+
+
+class Refresher(abc.ABC):
+    """Loads something at startup, then keeps refreshing it in the background.
+
+    Failed refreshes are logged and leave the last loaded data in place.
+    """
+
+    # The prefix of every log message about this refresher
+    name: str
+    interval: int
+    task: asyncio.Task[None] | None = None
+
+    def __init__(self, name: str, *, interval: int):
+        self.name = name
+        self.interval = interval
+
+    @abc.abstractmethod
+    async def refresh(self) -> object: ...
+
+    async def start(self):
+        """Loads the data, then keeps refreshing it every `interval` seconds."""
+        await self.refresh()
+
+        if self.interval != 0:
+            self.task = asyncio.create_task(self._refresh_task())
+
+    async def close(self):
+        if self.task is not None:
+            self.task.cancel()
+            await asyncio.gather(self.task, return_exceptions=True)
+
+    async def _refresh_task(self):
+        while True:
+            await asyncio.sleep(self.interval)
+
+            try:
+                await self.refresh()
+            except (CTFdError, aiohttp.ClientError, TimeoutError) as exc:
+                logger.warning(f"[{self.name}] {type(exc).__name__}: {exc}")
+            except Exception as exc:
+                logger.error(f"[{self.name}] {type(exc).__name__}: {exc}")
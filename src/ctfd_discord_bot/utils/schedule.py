@@ -0,0 +1,94 @@
+import time
+
+# A cycle taking more than this share of the interval means CTFd is struggling
+SLOW_CYCLE_RATIO = 0.5
+# How much each quiet cycle lengthens the interval
+QUIET_BACKOFF = 1.25
+# How much the solve rate must exceed its average for the interval to shorten
+RATE_RISE = 1.5
+# The weight of the latest cycle in the solve rate's moving average
+RATE_SMOOTHING = 0.3
+
+
+class AdaptiveSchedule:
+    """Chooses when to run the next poll from how the recent polls went.
+
+    The interval halves when the solve rate rises above its moving average and
+    lengthens gradually through quiet periods. While solves come in at a steady
+    rate, it eases back to the configured interval. Slow or failing polls back it
+    off, so a struggling CTFd isn't polled harder. Deadlines are measured from
+    when each poll started, so the time spent polling is not added on top of the
+    interval.
+    """
+
+    min_interval: float
+    max_interval: float
+    # The interval to return to while the solve rate is steady
+    base_interval: float
+    interval: float
+    errors: int
+    # Solves per second, as an exponential moving average over past cycles
+    solve_rate: float | None
+    # time.monotonic() timestamp of when the last successful poll started
+    last_started: float | None
+    # time.monotonic() timestamp of when the next poll is due
+    next_run: float
+
+    def __init__(self, interval: float, *, min_interval: float, max_interval: float):
+        self.min_interval = min_interval
+        self.max_interval = max(max_interval, min_interval)
+        self.base_interval = self._clamp(interval)
+        self.interval = self.base_interval
+        self.errors = 0
+        self.solve_rate = None
+        self.last_started = None
+        self.next_run = time.monotonic()
+
+    def _clamp(self, interval: float) -> float:
+        return min(max(interval, self.min_interval), self.max_interval)
+
+    def delay(self) -> float:
+        """Returns how long to wait before the next poll is due."""
+        return max(self.next_run - time.monotonic(), 0)
+
+    def record_cycle(self, started: float, elapsed: float, solves: int):
+        """Schedules the next poll after one that started at `started` and succeeded."""
+        self.errors = 0
+
+        window = self.interval
+        if self.last_started is not None:
+            window = started - self.last_started
+        self.last_started = started
+        rate = solves / window if window > 0 else 0
+
+        average = self.solve_rate
+        if solves == 0:
+            interval = self.interval * QUIET_BACKOFF
+        elif average is not None and rate > average * RATE_RISE:
+            interval = self.interval / 2
+        elif self.interval < self.base_interval:
+            interval = min(self.interval * QUIET_BACKOFF, self.base_interval)
+        else:
+            interval = self.interval
+
+        if average is None:
+            self.solve_rate = rate
+        else:
+            self.solve_rate = average + (rate - average) * RATE_SMOOTHING
+
+        # never poll so often that polling is most of what CTFd is doing for us
+        interval = max(interval, elapsed / SLOW_CYCLE_RATIO)
+
+        self.interval = self._clamp(interval)
+        self.next_run = started + self.interval
+
+    def record_error(self):
+        """Schedules the next poll after a failed one, backing off exponentially."""
+        self.errors += 1
+        # the floor keeps a zero interval from staying zero
+        self.interval = self._clamp(max(self.interval, 1) * 2)
+        self.next_run = time.monotonic() + self.interval
+
+    def standby(self):
+        """Schedules the next check while another process is doing the polling."""
+        self.next_run = time.monotonic() + self.max_interval
@@ -0,0 +1,94 @@
+import math
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import dataclass
+from types import MappingProxyType
+
+from loguru import logger
+
+from ctfd_discord_bot.utils.ctfd_api import CTFd_API, Member, Score
+from ctfd_discord_bot.utils.lazy import LazyList
+from ctfd_discord_bot.utils.refresher import Refresher
+
+type MemberKey = tuple[int, str, int | None]
+
+
+def member_keys(members: Sequence[Member]) -> tuple[MemberKey, ...]:
+    """Identifies what the members of an entry show, reading lazily loaded members
+    from their raw rows so they aren't decoded.
+    """
+    if isinstance(members, LazyList):
+        return tuple((row["id"], row["name"], row["score"]) for row in members.rows)
+
+    return tuple((member.id, member.name, member.score) for member in members)
+
+
+def entry_key(
+    entry: Score,
+) -> tuple[int, int | None, int, str, tuple[MemberKey, ...]]:
+    """Identifies what an entry shows."""
+    return (
+        entry.account_id,
+        entry.pos,
+        entry.score,
+        entry.name,
+        member_keys(entry.members),
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class ScoreboardSnapshot:
+    """An immutable, ranked copy of the scoreboard at one point in time."""
+
+    # Incremented whenever the scoreboard changes
+    version: int
+    entries: tuple[Score, ...]
+    # Maps team IDs to their rank
+    ranks: Mapping[int, int]
+
+    @classmethod
+    def build(cls, version: int, scoreboard: Iterable[Score]) -> "ScoreboardSnapshot":
+        # CTFd already ranks the scoreboard, so this sort is usually a single pass
+        entries = tuple(
+            sorted(scoreboard, key=lambda x: x.pos if x.pos is not None else math.inf)
+        )
+        ranks = {
+            entry.account_id: entry.pos if entry.pos is not None else i
+            for i, entry in enumerate(entries, start=1)
+        }
+        return cls(version, entries, MappingProxyType(ranks))
+
+
+class ScoreboardPoller(Refresher):
+    """Keeps the latest scoreboard in memory, refreshing it in the background.
+
+    Each refresh swaps in a new snapshot with a single assignment, so readers
+    should take `snapshot` once per command.
+    """
+
+    ctfd_api: CTFd_API
+    snapshot: ScoreboardSnapshot
+
+    def __init__(self, ctfd_api: CTFd_API, *, interval: int):
+        super().__init__("Scoreboard", interval=interval)
+        self.ctfd_api = ctfd_api
+        self.snapshot = ScoreboardSnapshot.build(0, [])
+
+    async def start(self):
+        await super().start()
+        logger.success(f"Cached {len(self.snapshot.entries)} teams on the scoreboard.")
+
+    async def refresh(self) -> bool:
+        """Fetches the scoreboard, returning whether it changed."""
+        scoreboard = await self.ctfd_api.get_scoreboard(invalidate_cache=True)
+
+        current = self.snapshot
+        new = ScoreboardSnapshot.build(current.version + 1, scoreboard)
+        # comparing the entries themselves would decode every member of every team
+        if list(map(entry_key, new.entries)) == list(map(entry_key, current.entries)):
+            return False
+
+        self.snapshot = new
+        logger.debug(
+            f"[Scoreboard] Updated to version {new.version} with {len(new.entries)} teams."
+        )
+        return True
@@ -0,0 +1,128 @@
+import json
+import os
+import sqlite3
+import time
+from collections.abc import Iterable
+from typing import Any
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS discord_users (
+    discord_id INTEGER PRIMARY KEY,
+    user_id INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS challenge_solves (
+    challenge_id INTEGER NOT NULL,
+    account_id INTEGER NOT NULL,
+    PRIMARY KEY (challenge_id, account_id)
+);
+
+CREATE TABLE IF NOT EXISTS leases (
+    name TEXT PRIMARY KEY,
+    owner TEXT NOT NULL,
+    expires REAL NOT NULL
+);
+"""
+
+
+class StateStore:
+    """Local SQLite store for any state that should survive a restart."""
+
+    connection: sqlite3.Connection
+
+    def __init__(self, path: str):
+        directory = os.path.dirname(path)
+        if directory != "" and not os.path.exists(directory):
+            os.makedirs(directory)
+
+        # autocommit mode, writes that must be atomic use an explicit transaction
+        self.connection = sqlite3.connect(path, isolation_level=None)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.executescript(SCHEMA)
+
+    def close(self):
+        self.connection.close()
+
+    def get_meta(self, key: str, default: Any = None) -> Any:
+        row = self.connection.execute(
+            "SELECT value FROM meta WHERE key = ?", (key,)
+        ).fetchone()
+        return default if row is None else json.loads(row[0])
+
+    def set_meta(self, key: str, value: Any):
+        self.connection.execute(
+            "INSERT INTO meta (key, value) VALUES (?, ?)"
+            " ON CONFLICT (key) DO UPDATE SET value = excluded.value",
+            (key, json.dumps(value)),
+        )
+
+    def load_discord_users(self) -> dict[int, int]:
+        return dict(
+            self.connection.execute("SELECT discord_id, user_id FROM discord_users")
+        )
+
+    def add_discord_users(
+        self,
+        users: Iterable[tuple[int, int]],
+        *,
+        watermark: dict[str, int] | None = None,
+    ):
+        """Stores (discord_id, user_id) pairs, along with the user scan watermark."""
+        with self.connection:
+            self.connection.execute("BEGIN")
+            self.connection.executemany(
+                "INSERT INTO discord_users (discord_id, user_id) VALUES (?, ?)"
+                " ON CONFLICT (discord_id) DO UPDATE SET user_id = excluded.user_id",
+                users,
+            )
+            if watermark is not None:
+                self.set_meta("users_watermark", watermark)
+
+    def remove_discord_user(self, discord_id: int):
+        self.connection.execute(
+            "DELETE FROM discord_users WHERE discord_id = ?", (discord_id,)
+        )
+
+    def load_challenge_solves(self) -> dict[int, set[int]]:
+        solves: dict[int, set[int]] = {}
+        for challenge_id, account_id in self.connection.execute(
+            "SELECT challenge_id, account_id FROM challenge_solves"
+        ):
+            solves.setdefault(challenge_id, set()).add(account_id)
+
+        return solves
+
+    def add_challenge_solves(self, solves: Iterable[tuple[int, int]]):
+        """Stores seen (challenge_id, account_id) pairs."""
+        with self.connection:
+            self.connection.execute("BEGIN")
+            self.connection.executemany(
+                "INSERT OR IGNORE INTO challenge_solves (challenge_id, account_id)"
+                " VALUES (?, ?)",
+                solves,
+            )
+
+    def acquire_lease(self, name: str, owner: str, ttl: float) -> bool:
+        """Takes or renews the named lease for `ttl` seconds.
+
+        Returns False if another owner holds a lease that has not expired yet.
+        """
+        now = time.time()
+        cursor = self.connection.execute(
+            "INSERT INTO leases (name, owner, expires) VALUES (?, ?, ?)"
+            " ON CONFLICT (name) DO UPDATE"
+            " SET owner = excluded.owner, expires = excluded.expires"
+            " WHERE leases.owner = excluded.owner OR leases.expires < ?",
+            (name, owner, now + ttl, now),
+        )
+        return cursor.rowcount == 1
+
+    def release_lease(self, name: str, owner: str):
+        self.connection.execute(
+            "DELETE FROM leases WHERE name = ? AND owner = ?", (name, owner)
+        )
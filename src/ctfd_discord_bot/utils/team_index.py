@@ -0,0 +1,138 @@
+import bisect
+from collections.abc import Iterable, Iterator
+
+# Updating more than this share of the teams at once rebuilds the index instead
+REBUILD_RATIO = 0.25
+
+
+def trigrams(key: str) -> set[str]:
+    return {key[i : i + 3] for i in range(len(key) - 2)}
+
+
+class TeamIndex:
+    """An in-memory index of team names for exact, prefix and substring lookups.
+
+    Prefix searches bisect a sorted list of case-folded names, while substring
+    searches intersect the teams sharing each trigram of the query.
+    """
+
+    ids: dict[str, int]
+    names: dict[int, str]
+    # (case-folded name, team ID), kept sorted
+    keys: list[tuple[str, int]]
+    trigrams: dict[str, set[int]]
+
+    def __init__(self):
+        self.ids = {}
+        self.names = {}
+        self.keys = []
+        self.trigrams = {}
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def resolve(self, name: str) -> int | None:
+        return self.ids.get(name)
+
+    def update(self, teams: Iterable[tuple[int, str]]) -> int:
+        """Brings the index in line with the (team_id, name) pairs in `teams`.
+
+        Returns how many teams were added, renamed or removed.
+        """
+        names = dict(teams)
+        changed = [
+            team_id
+            for team_id in names.keys() | self.names.keys()
+            if names.get(team_id) != self.names.get(team_id)
+        ]
+
+        if len(changed) > len(names) * REBUILD_RATIO:
+            self._rebuild(names)
+            return len(changed)
+
+        for team_id in changed:
+            if team_id in self.names:
+                self._remove(team_id)
+
+            if team_id in names:
+                self._add(team_id, names[team_id])
+
+        return len(changed)
+
+    def _rebuild(self, names: dict[int, str]):
+        self.names = names
+        self.ids = {name: team_id for team_id, name in names.items()}
+        self.keys = sorted(
+            (name.casefold(), team_id) for team_id, name in names.items()
+        )
+        self.trigrams = {}
+        for key, team_id in self.keys:
+            for trigram in trigrams(key):
+                self.trigrams.setdefault(trigram, set()).add(team_id)
+
+    def _add(self, team_id: int, name: str):
+        key = name.casefold()
+        self.names[team_id] = name
+        self.ids[name] = team_id
+        bisect.insort(self.keys, (key, team_id))
+        for trigram in trigrams(key):
+            self.trigrams.setdefault(trigram, set()).add(team_id)
+
+    def _remove(self, team_id: int):
+        name = self.names.pop(team_id)
+        key = name.casefold()
+        if self.ids.get(name) == team_id:
+            del self.ids[name]
+
+        index = bisect.bisect_left(self.keys, (key, team_id))
+        if index < len(self.keys) and self.keys[index] == (key, team_id):
+            del self.keys[index]
+
+        for trigram in trigrams(key):
+            team_ids = self.trigrams[trigram]
+            team_ids.discard(team_id)
+            if len(team_ids) == 0:
+                del self.trigrams[trigram]
+
+    def _prefixed(self, query: str) -> Iterator[int]:
+        index = bisect.bisect_left(self.keys, (query,))
+        while index < len(self.keys) and self.keys[index][0].startswith(query):
+            yield self.keys[index][1]
+            index += 1
+
+    def _containing(self, query: str) -> Iterator[int]:
+        if len(query) < 3:
+            # too short to have any trigrams, so check every name
+            candidates = (team_id for _, team_id in self.keys)
+        else:
+            sets = sorted(
+                (self.trigrams.get(trigram, set()) for trigram in trigrams(query)),
+                key=len,
+            )
+            matches = set.intersection(*sets)
+            candidates = sorted(matches, key=lambda id: self.names[id].casefold())
+
+        for team_id in candidates:
+            if query in self.names[team_id].casefold():
+                yield team_id
+
+    def search(self, query: str, limit: int) -> list[str]:
+        """Returns up to `limit` names containing `query`, case-insensitively.
+
+        Names starting with the query come first, each group in alphabetical order.
+        """
+        query = query.casefold()
+        found: dict[int, None] = {}
+
+        for team_id in self._prefixed(query):
+            if len(found) >= limit:
+                break
+            found[team_id] = None
+
+        if len(found) < limit:
+            for team_id in self._containing(query):
+                if len(found) >= limit:
+                    break
+                found.setdefault(team_id, None)
+
+        return [self.names[team_id] for team_id in found]
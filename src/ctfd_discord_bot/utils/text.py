@@ -0,0 +1,27 @@
+from collections.abc import Iterable
+
+
+def pack_lines(lines: Iterable[str], limit: int) -> list[str]:
+    """Joins lines into as few chunks as possible, each at most `limit` long.
+
+    Lines are never split, unless a single line is over the limit and is truncated.
+    """
+    messages: list[str] = []
+    current = ""
+
+    for line in lines:
+        if len(line) > limit:
+            line = line[: limit - 1] + "…"
+
+        if current == "":
+            current = line
+        elif len(current) + 1 + len(line) <= limit:
+            current += "\n" + line
+        else:
+            messages.append(current)
+            current = line
+
+    if current != "":
+        messages.append(current)
+
+    return messages
@@ -0,0 +1,129 @@
+import asyncio
+import random
+from collections.abc import Iterable
+from typing import Any
+
+import aiohttp
+from aiohttp import ClientSession, ClientTimeout
+from loguru import logger
+
+from ctfd_discord_bot.utils.text import pack_lines
+
+# Discord's limit on the length of a message's content
+MESSAGE_LIMIT = 2000
+MAX_BACKOFF = 60
+
+
+class WebhookSender:
+    """Delivers lines to a Discord webhook in the background.
+
+    Queued lines are packed into as few messages as the length limit allows, and
+    each message is retried with backoff, honouring Discord's rate limits, so that
+    slow or failed deliveries never hold up the caller.
+    """
+
+    url: str
+    max_retries: int
+    session: ClientSession
+    queue: asyncio.Queue[str]
+    task: asyncio.Task[None]
+
+    def __init__(self, url: str, *, timeout: int, max_retries: int = 5):
+        self.url = url
+        self.max_retries = max_retries
+        self.session = ClientSession(timeout=ClientTimeout(total=timeout))
+        self.queue = asyncio.Queue()
+        self.task = asyncio.create_task(self._deliver_task())
+
+    def send(self, lines: Iterable[str]):
+        for line in lines:
+            self.queue.put_nowait(line)
+
+    async def close(self):
+        self.task.cancel()
+        await asyncio.gather(self.task, return_exceptions=True)
+        await self.session.close()
+
+        if not self.queue.empty():
+            logger.warning(
+                f"[Webhook] Dropped {self.queue.qsize()} undelivered lines on close."
+            )
+
+    async def _deliver_task(self):
+        while True:
+            lines = [await self.queue.get()]
+            while not self.queue.empty():
+                lines.append(self.queue.get_nowait())
+
+            for message in pack_lines(lines, MESSAGE_LIMIT):
+                # anything unexpected only loses this message, not every later one
+                try:
+                    await self._deliver(message)
+                except Exception as exc:
+                    logger.error(f"[Webhook] {type(exc).__name__}: {exc}")
+
+    async def _deliver(self, content: str):
+        for attempt in range(self.max_retries + 1):
+            delay = min(2**attempt, MAX_BACKOFF) * random.uniform(0.5, 1.5)
+
+            try:
+                async with self.session.post(
+                    self.url, json={"content": content}
+                ) as response:
+                    if response.status == 429:
+                        delay = await get_retry_after(response, delay)
+                        logger.warning(
+                            f"[Webhook] Rate limited, retrying in {delay:.1f}s."
+                        )
+                    elif response.status >= 500:
+                        logger.warning(
+                            f"[Webhook] Discord returned {response.status}, retrying in {delay:.1f}s."
+                        )
+                    elif response.status >= 400:
+                        logger.error(
+                            f"[Webhook] Discord rejected a message: {response.status} {response.reason}"
+                        )
+                        return
+                    else:
+                        # wait out the bucket now rather than getting a 429 next time
+                        if response.headers.get("X-RateLimit-Remaining") == "0":
+                            reset_after = response.headers.get(
+                                "X-RateLimit-Reset-After"
+                            )
+                            await asyncio.sleep(parse_delay(reset_after, 0))
+                        return
+            except (aiohttp.ClientError, TimeoutError) as exc:
+                logger.warning(
+                    f"[Webhook] {type(exc).__name__}: {exc}, retrying in {delay:.1f}s."
+                )
+
+            if attempt < self.max_retries:
+                await asyncio.sleep(delay)
+
+        logger.error(
+            f"[Webhook] Gave up delivering a message after {self.max_retries + 1} attempts."
+        )
+
+
+def parse_delay(value: Any, default: float) -> float:
+    """Parses a delay sent by Discord, capped at MAX_BACKOFF."""
+    try:
+        delay = float(value)
+    except (TypeError, ValueError):
+        return default
+
+    if not 0 <= delay < float("inf"):
+        return default
+
+    return min(delay, MAX_BACKOFF)
+
+
+async def get_retry_after(response: aiohttp.ClientResponse, default: float) -> float:
+    if "Retry-After" in response.headers:
+        return parse_delay(response.headers["Retry-After"], default)
+
+    try:
+        body = await response.json()
+        return parse_delay(body["retry_after"], default)
+    except (aiohttp.ContentTypeError, KeyError, TypeError, ValueError):
+        return default
@@ -0,0 +1,91 @@
+import typing
+from collections.abc import Iterable
+
+import discord
+
+# Discord's limits on a message's embeds
+MAX_EMBEDS = 10
+MAX_EMBEDS_LENGTH = 6000
+
+
+def pack_embeds(embeds: Iterable[discord.Embed]) -> list[list[discord.Embed]]:
+    """Groups embeds into as few messages as possible within Discord's limits."""
+    messages: list[list[discord.Embed]] = []
+    current: list[discord.Embed] = []
+    length = 0
+
+    for embed in embeds:
+        if current and (
+            len(current) == MAX_EMBEDS or length + len(embed) > MAX_EMBEDS_LENGTH
+        ):
+            messages.append(current)
+            current = []
+            length = 0
+
+        current.append(embed)
+        length += len(embed)
+
+    if current:
+        messages.append(current)
+
+    return messages
+
+
+class EmbedPaginator(discord.ui.View):
+    """Pages through groups of embeds by editing a single message."""
+
+    pages: list[list[discord.Embed]]
+    current_index: int
+
+    def __init__(self, pages: list[list[discord.Embed]], current_index: int = 0):
+        super().__init__(timeout=180)
+        self.pages = pages
+        self.current_index = current_index
+        self.update_buttons()
+
+    @classmethod
+    async def send(
+        cls, interaction: discord.Interaction, embeds: Iterable[discord.Embed]
+    ):
+        """Sends the embeds as one ephemeral followup, paginated if they don't fit."""
+        pages = pack_embeds(embeds)
+        if len(pages) == 1:
+            await interaction.followup.send(embeds=pages[0], ephemeral=True)
+            return
+
+        view = cls(pages)
+        await interaction.followup.send(embeds=pages[0], view=view, ephemeral=True)
+
+    def update_buttons(self):
+        self.left.disabled = self.current_index <= 0
+        self.right.disabled = self.current_index >= len(self.pages) - 1
+        self.page.label = f"Page {self.current_index + 1} of {len(self.pages)}"
+
+    async def show_page(self, interaction: discord.Interaction, index: int):
+        self.current_index = index
+        self.update_buttons()
+        await interaction.response.edit_message(
+            embeds=self.pages[self.current_index], view=self
+        )
+
+    # ⬅️
+    @discord.ui.button(emoji="⬅️", style=discord.ButtonStyle.secondary)
+    async def left(
+        self, interaction: discord.Interaction, _button: discord.ui.Button[typing.Self]
+    ):
+        if self.current_index > 0:
+            await self.show_page(interaction, self.current_index - 1)
+
+    @discord.ui.button(label="Page", style=discord.ButtonStyle.primary, disabled=True)
+    async def page(
+        self, interaction: discord.Interaction, _button: discord.ui.Button[typing.Self]
+    ):
+        pass
+
+    # ➡️
+    @discord.ui.button(emoji="➡️", style=discord.ButtonStyle.secondary)
+    async def right(
+        self, interaction: discord.Interaction, _button: discord.ui.Button[typing.Self]
+    ):
+        if self.current_index < len(self.pages) - 1:
+            await self.show_page(interaction, self.current_index + 1)
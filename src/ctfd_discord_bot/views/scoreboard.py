@@ -1,10 +1,15 @@
 import datetime
+import math
 import typing
+from collections.abc import Sequence
 
 import discord
 
 from ctfd_discord_bot.utils.ctfd_api import Score
 
+# Teams shown per page of the scoreboard list
+PAGE_SIZE = 10
+
 
 def get_team_embed(team: Score) -> discord.Embed:
     desc_prefix = title_prefix = ""
@@ -31,43 +36,54 @@ def get_team_embed(team: Score) -> discord.Embed:
 
 
 class Scoreboard(discord.ui.View):
-    scoreboard: list[Score]
+    scoreboard: Sequence[Score]
     current_index: int
+    current_page: int
     showing_list: bool
 
-    def __init__(self, scoreboard: list[Score], current_index: int = 0):
+    def __init__(self, scoreboard: Sequence[Score], current_index: int = 0):
         super().__init__(timeout=180)
         self.scoreboard = scoreboard
         self.current_index = current_index
+        self.current_page = current_index // PAGE_SIZE
         self.showing_list = True
         self.update_buttons()
 
+    @property
+    def page_count(self) -> int:
+        return max(math.ceil(len(self.scoreboard) / PAGE_SIZE), 1)
+
     def update_buttons(self):
         """Enable/disable navigation depending on mode and index."""
-        self.left.disabled = self.showing_list or self.current_index <= 0
-        self.right.disabled = (
-            self.showing_list or self.current_index >= len(self.scoreboard) - 1
-        )
+        if self.showing_list:
+            self.left.disabled = self.current_page <= 0
+            self.right.disabled = self.current_page >= self.page_count - 1
+        else:
+            self.left.disabled = self.current_index <= 0
+            self.right.disabled = self.current_index >= len(self.scoreboard) - 1
+
         self.list.label = (
             "📋 View Team Details" if self.showing_list else "📋 Back to Team List"
         )
 
     def get_list_embed(self):
-        """Embed showing all teams in the description."""
+        """Embed showing the current page of teams in the description."""
         embed = discord.Embed(
             title=":trophy: Scoreboard: All Teams",
             color=discord.Color.blue(),
             timestamp=datetime.datetime.now(datetime.timezone.utc),
         )
 
-        # Build a formatted description string
+        # Only the teams on this page are ever read from the scoreboard
+        start = self.current_page * PAGE_SIZE
         description_lines: list[str] = []
-        for entry in self.scoreboard:
+        for entry in self.scoreboard[start : start + PAGE_SIZE]:
             description_lines.append(
                 f"{entry.pos}.**{entry.name}**: *({entry.score} points)*"
             )
 
         embed.description = "\n".join(description_lines)
+        embed.set_footer(text=f"Page {self.current_page + 1} of {self.page_count}")
         return embed
 
     def get_team_embed(self):
@@ -80,17 +96,23 @@ class Scoreboard(discord.ui.View):
 
         return embed
 
+    def get_embed(self):
+        return self.get_list_embed() if self.showing_list else self.get_team_embed()
+
     # ⬅️
     @discord.ui.button(emoji="⬅️", style=discord.ButtonStyle.secondary)
     async def left(
         self, interaction: discord.Interaction, _button: discord.ui.Button[typing.Self]
     ):
-        if not self.showing_list and self.current_index > 0:
+        if self.showing_list and self.current_page > 0:
+            self.current_page -= 1
+        elif not self.showing_list and self.current_index > 0:
             self.current_index -= 1
-            self.update_buttons()
-            await interaction.response.edit_message(
-                embed=self.get_team_embed(), view=self
-            )
+        else:
+            return
+
+        self.update_buttons()
+        await interaction.response.edit_message(embed=self.get_embed(), view=self)
 
     # 📋
     @discord.ui.button(label="📋 View Team Details", style=discord.ButtonStyle.primary)
@@ -99,19 +121,26 @@ class Scoreboard(discord.ui.View):
     ):
         """Toggle between list and single team view."""
         self.showing_list = not self.showing_list
+        # keep the list and team views in step with each other
+        if self.showing_list:
+            self.current_page = self.current_index // PAGE_SIZE
+        else:
+            self.current_index = self.current_page * PAGE_SIZE
+
         self.update_buttons()
-        embed = self.get_list_embed() if self.showing_list else self.get_team_embed()
-        await interaction.response.edit_message(embed=embed, view=self)
+        await interaction.response.edit_message(embed=self.get_embed(), view=self)
 
     # ➡️
     @discord.ui.button(emoji="➡️", style=discord.ButtonStyle.secondary)
     async def right(
         self, interaction: discord.Interaction, _button: discord.ui.Button[typing.Self]
     ):
-        if not self.showing_list and self.current_index < len(self.scoreboard) - 1:
+        if self.showing_list and self.current_page < self.page_count - 1:
+            self.current_page += 1
+        elif not self.showing_list and self.current_index < len(self.scoreboard) - 1:
             self.current_index += 1
-            self.update_buttons()
-            await interaction.response.edit_message(
-                embed=self.get_team_embed(),
-                view=self,
-            )
+        else:
+            return
+
+        self.update_buttons()
+        await interaction.response.edit_message(embed=self.get_embed(), view=self)